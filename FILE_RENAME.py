@@ -1,42 +1,61 @@
 import os
 import re
+import sys
+
+# 파일 이름 패턴 (MIC와 ACC 모두 처리) - 반복마다 컴파일하지 않도록 모듈 로드 시 한 번만 컴파일
+_PAT = re.compile(r'\d{2}_(\d{8})_(\d{2})_(\d{2})_(\d{2})_(MP\d+ABS\d+_MIC|LSM6DSOX_ACC)\.dat')
 
 def rename_files(directory):
-    # 디렉토리 내의 모든 파일 검색
-    for filename in os.listdir(directory):
-        # 파일 이름 패턴 매칭 (MIC와 ACC 모두 처리)
-        pattern = r'\d{2}_(\d{8})_(\d{2})_(\d{2})_(\d{2})_(MP\d+ABS\d+_MIC|LSM6DSOX_ACC)\.dat'
-        match = re.match(pattern, filename)
-        
-        if match:
-            # 패턴에서 필요한 정보 추출
-            date = match.group(1)
-            hour = match.group(2)
-            minute = match.group(3)
-            second = match.group(4)
-            sensor_id = match.group(5)
-            
-            # 새로운 파일 이름 생성
-            new_filename = f"{sensor_id}_{date}_{hour}_{minute}_{second}.dat"
-            
-            # 전체 경로 생성
-            old_path = os.path.join(directory, filename)
-            new_path = os.path.join(directory, new_filename)
-            
-            try:
-                # 파일 이름 변경
-                os.rename(old_path, new_path)
-                print(f"변경 완료: {filename} -> {new_filename}")
-            except Exception as e:
-                print(f"오류 발생: {filename} - {str(e)}")
+    # 변경 결과는 모아 두었다가 마지막에 한 번에 출력 (파일마다 print하면 느림)
+    renamed = []
+
+    # 디렉토리 내의 모든 파일 검색 (전체 목록을 만들지 않고 순차 처리)
+    with os.scandir(directory) as it:
+        for entry in it:
+            filename = entry.name
+            if not filename.endswith('.dat') or not entry.is_file():
+                continue
+
+            # 파일 이름 패턴 매칭
+            match = _PAT.match(filename)
+
+            if match:
+                # 패턴에서 필요한 정보 추출
+                date = match.group(1)
+                hour = match.group(2)
+                minute = match.group(3)
+                second = match.group(4)
+                sensor_id = match.group(5)
+
+                # 새로운 파일 이름 생성
+                new_filename = f"{sensor_id}_{date}_{hour}_{minute}_{second}.dat"
+
+                # 전체 경로 생성
+                old_path = os.path.join(directory, filename)
+                new_path = os.path.join(directory, new_filename)
+
+                # 앞의 두 자리 번호를 빼므로 다른 파일과 같은 이름이 될 수 있음 - 덮어쓰지 않고 건너뜀
+                if os.path.exists(new_path):
+                    print(f"건너뜀: {filename} -> {new_filename} (같은 이름의 파일이 이미 있음)")
+                    continue
+
+                try:
+                    # 파일 이름 변경
+                    os.replace(old_path, new_path)
+                    renamed.append((filename, new_filename))
+                except Exception as e:
+                    print(f"오류 발생: {filename} - {str(e)}")
+
+    if renamed:
+        sys.stdout.write("".join(f"변경 완료: {o} -> {n}\n" for o, n in renamed))
 
 if __name__ == "__main__":
     # 사용자로부터 디렉토리 경로 입력 받기
     directory = input("파일이 있는 디렉토리 경로를 입력하세요: ")
-    
+
     # 디렉토리가 존재하는지 확인
     if os.path.exists(directory):
         rename_files(directory)
         print("모든 파일 이름 변경이 완료되었습니다.")
     else:
-        print("입력한 디렉토리가 존재하지 않습니다.")
\ No newline at end of file
+        print("입력한 디렉토리가 존재하지 않습니다.")
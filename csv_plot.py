@@ -1,12 +1,21 @@
 #!/usr/bin/env python3
 # large_csv_plotter.py - 대용량 CSV 파일 시각화 도구 (30분 단위 시간축)
 
+import math
+import re
 import pandas as pd
 import numpy as np
+import numba
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+import os
 import sys
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QFileDialog,
@@ -14,12 +23,89 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QButtonGroup, QSlider, QCheckBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 import gc
-from datetime import datetime, timedelta
+from datetime import datetime
+
+# 조밀한 선을 그릴 때 Agg가 거의 일직선인 구간을 합쳐 그리도록 경로 단순화 설정
+mpl.rcParams['path.simplify'] = True
+mpl.rcParams['path.simplify_threshold'] = 1.0
+mpl.rcParams['agg.path.chunksize'] = 10_000
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def _mag(x, y, z, out):
+    """x, y, z 벡터 크기를 임시 배열 없이 한 번에 계산"""
+    for i in numba.prange(x.size):
+        out[i] = math.sqrt(x[i]*x[i] + y[i]*y[i] + z[i]*z[i])
+
+
+# 원시 DAT 레코드 구조: 1000 샘플(int16) + 8바이트 푸터
+_ACC_RECORD = np.dtype([('xyz', '<i2', (1000, 3)), ('footer', 'V8')])  # 6008 바이트
+_MIC_RECORD = np.dtype([('mic', '<i2', (1000,)), ('footer', 'V8')])    # 2008 바이트
+_ACC_SCALE = 0.000488
+# 파일명의 측정 시작 시각 (..._YYYYMMDD_HH_MM_SS...)
+_DAT_TIME_PAT = re.compile(r'(\d{8})_(\d{2})_(\d{2})_(\d{2})')
+# 자주 쓰는 timestamp 형식 (첫 값으로 판별해 pd.to_datetime에 format을 지정)
+_TS_FORMATS = [
+    (re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+$'), '%Y-%m-%d %H:%M:%S.%f'),
+    (re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$'), '%Y-%m-%d %H:%M:%S'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+$'), '%Y-%m-%dT%H:%M:%S.%f'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$'), '%Y-%m-%dT%H:%M:%S'),
+    (re.compile(r'\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}\.\d+$'), '%Y/%m/%d %H:%M:%S.%f'),
+    (re.compile(r'\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}$'), '%Y/%m/%d %H:%M:%S'),
+]
+
+
+def _sniff_ts_format(value):
+    """timestamp 문자열 하나로 형식 판별 (알 수 없으면 None)"""
+    for pat, fmt in _TS_FORMATS:
+        if pat.match(value):
+            return fmt
+    return None
+
+
+def _parse_timestamps(values):
+    """timestamp 문자열 배열을 datetime64 배열로 변환 (형식을 알면 format 지정으로 빠른 파서 사용, 실패하면 자동 추론)"""
+    fmt = _sniff_ts_format(str(values[0]).strip()) if len(values) else None
+    try:
+        ts = pd.to_datetime(values, format=fmt, cache=True) if fmt else None
+    except ValueError:
+        ts = None
+    if ts is None:
+        ts = pd.to_datetime(values)
+    return ts.to_numpy()
+
+
+def _minmax_bucket(x, y, n_buckets):
+    """구간(픽셀 열)마다 min/max 두 점만 남겨 파형 외곽선을 유지하면서 점 수를 줄임"""
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return x, y
+    step = -(-n // n_buckets)
+    pad = (-n) % step
+    ypad = np.pad(y.astype(np.float32, copy=False), (0, pad), constant_values=np.nan)
+    r = ypad.reshape(-1, step)
+    yb = np.column_stack([np.nanmin(r, axis=1), np.nanmax(r, axis=1)]).ravel()
+    xb = np.repeat(x[::step], 2)
+    return xb, yb
+
+
+def _line_segments(x, y, color):
+    """연속한 점을 잇는 선분 배열로 LineCollection 생성 (Agg에서 한 번에 그림)
+    
+    x가 날짜 숫자(일 단위)이면 float32로는 분 단위 정밀도밖에 안 되므로 float64 유지
+    """
+    segs = np.empty((max(len(y) - 1, 0), 2, 2), dtype=np.float64)
+    segs[:, 0, 0] = x[:-1]
+    segs[:, 1, 0] = x[1:]
+    segs[:, 0, 1] = y[:-1]
+    segs[:, 1, 1] = y[1:]
+    return LineCollection(segs, colors=color, linewidths=0.5)
+
 
 class DataLoader(QThread):
     """백그라운드에서 데이터를 로드하는 스레드"""
     progress = pyqtSignal(str)
-    finished = pyqtSignal(pd.DataFrame, dict)
+    finished = pyqtSignal(dict, dict)
     error = pyqtSignal(str)
     
     def __init__(self, file_path, sample_rate=None):
@@ -27,8 +113,80 @@ class DataLoader(QThread):
         self.file_path = file_path
         self.sample_rate = sample_rate
         
+    def _downsample_rate(self, total_rows):
+        """행 수에 따른 다운샘플링 비율 결정"""
+        if total_rows > 10_000_000:  # 1000만개 이상
+            self.progress.emit(f"대용량 파일 감지: {total_rows:,}개 행 (1/100 다운샘플링)")
+            return 100
+        elif total_rows > 1_000_000:  # 100만개 이상
+            self.progress.emit(f"중간 크기 파일: {total_rows:,}개 행 (1/10 다운샘플링)")
+            return 10
+        else:
+            self.progress.emit(f"소규모 파일: {total_rows:,}개 행 (다운샘플링 없음)")
+            return 1
+    
+    def _load_dat(self):
+        """원시 DAT 파일을 memmap으로 열어 텍스트 파싱 없이 배열로 변환"""
+        name = os.path.basename(self.file_path)
+        if 'ACC' in name.upper():
+            sensor_type, record, fs = 'ACC', _ACC_RECORD, 1666
+        elif 'MIC' in name.upper():
+            sensor_type, record, fs = 'MIC', _MIC_RECORD, 8000
+        else:
+            raise ValueError(f"파일명으로 센서 타입을 알 수 없음: {name}")
+        if self.sample_rate:
+            fs = self.sample_rate
+        
+        # 끝의 불완전한 레코드는 버림
+        n_records = os.path.getsize(self.file_path) // record.itemsize
+        if n_records == 0:
+            raise ValueError(f"불완전 DAT: 레코드가 없음 ({name})")
+        total_rows = n_records * 1000
+        downsample_rate = self._downsample_rate(total_rows)
+        
+        self.progress.emit("DAT 메모리 맵 로드 중...")
+        arr = np.memmap(self.file_path, dtype=record, mode='r', shape=(n_records,))
+        # 필요한 샘플만 (레코드, 샘플) 위치로 골라 읽음 (reshape는 전체를 복사함)
+        idx = np.arange(0, total_rows, downsample_rate)
+        rec, pos = idx // 1000, idx % 1000
+        if sensor_type == 'ACC':
+            xyz = arr['xyz'][rec, pos]
+            scale = np.float32(_ACC_SCALE)
+            data = {'x': xyz[:, 0] * scale, 'y': xyz[:, 1] * scale, 'z': xyz[:, 2] * scale}
+        else:
+            data = {'mic_value': arr['mic'][rec, pos].astype(np.float32)}
+        del idx, rec, pos
+        del arr
+        loaded_rows = len(next(iter(data.values())))
+        
+        # 파일명에 시작 시각이 있으면 샘플링 레이트로 timestamp 생성
+        m = _DAT_TIME_PAT.search(name)
+        if m:
+            try:
+                start = np.datetime64(pd.Timestamp(f"{m.group(1)} {m.group(2)}:{m.group(3)}:{m.group(4)}"), 'us')
+                step_us = downsample_rate * 1e6 / fs
+                data['timestamp'] = start + (np.arange(loaded_rows) * step_us).astype('timedelta64[us]')
+            except ValueError:
+                self.progress.emit("파일명 시각 변환 실패, 인덱스 사용")
+        
+        metadata = {
+            'sensor_type': sensor_type,
+            'total_rows_estimate': total_rows,
+            'loaded_rows': loaded_rows,
+            'downsample_rate': downsample_rate,
+            'columns': list(data),
+            'sample_rate': fs
+        }
+        return data, metadata
+    
     def run(self):
         try:
+            # 원시 DAT은 CSV 변환 없이 바로 읽음
+            if self.file_path.lower().endswith('.dat'):
+                data, metadata = self._load_dat()
+                self.finished.emit(data, metadata)
+                return
+            
             # 1. 빠른 미리보기를 위해 첫 몇 줄만 읽어서 컬럼 확인
             self.progress.emit("파일 구조 확인 중...")
             preview = pd.read_csv(self.file_path, nrows=5)
@@ -47,45 +205,81 @@ class DataLoader(QThread):
             chunk_size = 1_000_000  # 100만 행씩 읽기
             
             # 다운샘플링 비율 자동 계산
-            total_rows = sum(1 for _ in open(self.file_path)) - 1  # 헤더 제외
-            
-            if total_rows > 10_000_000:  # 1000만개 이상
-                downsample_rate = 100
-                self.progress.emit(f"대용량 파일 감지: {total_rows:,}개 행 (1/100 다운샘플링)")
-            elif total_rows > 1_000_000:  # 100만개 이상
-                downsample_rate = 10
-                self.progress.emit(f"중간 크기 파일: {total_rows:,}개 행 (1/10 다운샘플링)")
-            else:
-                downsample_rate = 1
-                self.progress.emit(f"소규모 파일: {total_rows:,}개 행 (다운샘플링 없음)")
+            # 전체 파일을 한 번 더 읽지 않도록 앞부분 1MB의 평균 행 길이로 행 수 추정
+            size = os.path.getsize(self.file_path)
+            with open(self.file_path, 'rb') as f:
+                sample = f.read(1_048_576)
+            nl = sample.count(b"\n")
+            total_rows = max(int(size / (len(sample) / max(nl, 1))) - 1, 0)  # 헤더 제외
+            downsample_rate = self._downsample_rate(total_rows)
             
             # 3. 효율적인 데이터 로드
-            if downsample_rate > 1:
-                # 다운샘플링하여 읽기
-                skiprows = lambda x: x % downsample_rate != 0
-                df = pd.read_csv(self.file_path, skiprows=skiprows)
+            # 센서 값은 float32로 충분하고, timestamp는 pyarrow가 읽으면서 바로 파싱
+            # 같은 파일을 다시 열 때는 CSV 옆에 저장해 둔 Parquet 캐시를 사용
+            pq_path = self.file_path + ".parquet"
+            if os.path.exists(pq_path) and os.path.getmtime(pq_path) >= os.path.getmtime(self.file_path):
+                self.progress.emit("Parquet 캐시에서 로드 중...")
+                table = pq.read_table(pq_path)
             else:
-                # 전체 읽기
-                df = pd.read_csv(self.file_path)
-            
-            # 4. timestamp 처리
-            if 'timestamp' in df.columns:
+                # 멀티스레드 블록 파싱 + 컬럼 타입 지정 (타입 추론 생략)
+                # 블록 하나가 스레드 하나에 배정되므로 모든 코어가 블록을 받도록 크기 조정 (1~64MB)
+                column_types = {c: pa.float32() for c in ('x', 'y', 'z', 'mic_value') if c in columns}
+                block_size = min(max(size // (os.cpu_count() or 1), 1 << 20), 64 << 20)
+                read_options = pacsv.ReadOptions(block_size=block_size, use_threads=True)
+                try:
+                    table = pacsv.read_csv(
+                        self.file_path,
+                        read_options=read_options,
+                        convert_options=pacsv.ConvertOptions(
+                            column_types={**column_types, 'timestamp': pa.timestamp('ns')}
+                            if 'timestamp' in columns else column_types)
+                    )
+                except pa.ArrowInvalid:
+                    # 표준 형식이 아닌 timestamp는 문자열로 읽고 변환한 뒤 캐시에 저장 (다음 로드부터 다시 파싱하지 않음)
+                    table = pacsv.read_csv(
+                        self.file_path,
+                        read_options=read_options,
+                        convert_options=pacsv.ConvertOptions(column_types=column_types)
+                    )
+                    if 'timestamp' in table.column_names:
+                        try:
+                            ts = _parse_timestamps(table.column('timestamp').to_numpy(zero_copy_only=False))
+                            table = table.set_column(table.column_names.index('timestamp'), 'timestamp',
+                                                     pa.array(ts))
+                        except (ValueError, TypeError):
+                            pass  # 변환하지 못하면 문자열로 두고 아래에서 인덱스 사용
+                try:
+                    pq.write_table(table, pq_path, compression='zstd', row_group_size=1_000_000)
+                except OSError as e:
+                    self.progress.emit(f"Parquet 캐시 저장 실패: {e}")
+            if downsample_rate > 1:
+                # 다운샘플링: 행 선택을 파이썬 콜백 대신 Arrow take로 처리
+                table = table.take(pa.array(np.arange(0, table.num_rows, downsample_rate)))
+
+            # 플롯에 필요한 컬럼만 NumPy 배열로 꺼냄 (DataFrame 생성 생략)
+            data = {c: table.column(c).to_numpy()
+                    for c in ('timestamp', 'x', 'y', 'z', 'mic_value')
+                    if c in table.column_names}
+
+            # 4. timestamp 처리 (읽는 중 파싱되지 않은 경우에만 변환)
+            if 'timestamp' in data and not np.issubdtype(data['timestamp'].dtype, np.datetime64):
                 try:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
+                    data['timestamp'] = _parse_timestamps(data['timestamp'])
                 except:
                     self.progress.emit("timestamp 변환 실패, 인덱스 사용")
+                    del data['timestamp']
             
             # 메타데이터
             metadata = {
                 'sensor_type': sensor_type,
-                'total_rows': total_rows,
-                'loaded_rows': len(df),
+                'total_rows_estimate': total_rows,
+                'loaded_rows': table.num_rows,
                 'downsample_rate': downsample_rate,
                 'columns': columns,
                 'sample_rate': self.sample_rate
             }
             
-            self.finished.emit(df, metadata)
+            self.finished.emit(data, metadata)
             
         except Exception as e:
             self.error.emit(f"데이터 로드 실패: {str(e)}")
@@ -98,16 +292,20 @@ class PlotCanvas(FigureCanvas):
         super().__init__(self.fig)
         self.setParent(parent)
         
-    def plot_data(self, df, metadata, plot_type='time', time_range=None):
-        """데이터 플롯"""
+    def plot_data(self, data, metadata, plot_type='time', time_range=None):
+        """데이터 플롯 (data: 컬럼명 → NumPy 배열 dict)"""
         self.fig.clear()
         
         sensor_type = metadata['sensor_type']
         
+        # 시간 범위는 한 번만 계산해서 모든 컬럼을 같은 구간의 뷰로 전달 (복사 없음)
+        lo, hi = self._slice_range(data, time_range)
+        view = {k: v[lo:hi] for k, v in data.items()}
+        
         if sensor_type == 'ACC':
-            self._plot_acc_data(df, plot_type, time_range)
+            self._plot_acc_data(view, plot_type, lo)
         elif sensor_type == 'MIC':
-            self._plot_mic_data(df, plot_type, time_range)
+            self._plot_mic_data(view, plot_type, lo)
         else:
             ax = self.fig.add_subplot(111)
             ax.text(0.5, 0.5, '지원하지 않는 데이터 형식', 
@@ -133,14 +331,28 @@ class PlotCanvas(FigureCanvas):
             ax.grid(True, which='major', alpha=0.5)
             ax.grid(True, which='minor', alpha=0.2, linestyle=':')
     
-    def _plot_acc_data(self, df, plot_type, time_range=None):
-        """가속도계 데이터 플롯"""
-        # 시간 범위 필터링
-        if time_range and 'timestamp' in df.columns:
-            mask = (df.index >= time_range[0]) & (df.index <= time_range[1])
-            df_plot = df.loc[mask]
-        else:
-            df_plot = df
+    def _n_buckets(self):
+        """캔버스 가로 픽셀 수 (min/max 버킷 개수)"""
+        return int(self.fig.get_size_inches()[0] * self.fig.dpi)
+    
+    def _slice_range(self, data, time_range):
+        """시간 범위 (t0, t1) (matplotlib 날짜 숫자)에 해당하는 (lo, hi) 슬라이스 경계 계산
+        
+        시간 순으로 정렬된 데이터이므로 마스크 대신 이진 탐색 두 번으로 경계를 찾음
+        """
+        n = len(next(iter(data.values())))
+        if time_range and 'ts_num' in data:
+            ts = data['ts_num']
+            lo = np.searchsorted(ts, time_range[0])
+            hi = np.searchsorted(ts, time_range[1], side='right')
+            return lo, hi
+        return 0, n
+    
+    def _plot_acc_data(self, data, plot_type, offset=0):
+        """가속도계 데이터 플롯 (data: 시간 범위로 잘라 둔 배열 뷰, offset: 시작 샘플 번호)"""
+        x, y, z = data['x'], data['y'], data['z']
+        n = len(x)
+        has_timestamp = 'timestamp' in data
         
         if plot_type == 'time':
             # 시계열 플롯
@@ -148,23 +360,21 @@ class PlotCanvas(FigureCanvas):
             ax2 = self.fig.add_subplot(312, sharex=ax1)
             ax3 = self.fig.add_subplot(313, sharex=ax1)
             
-            has_timestamp = 'timestamp' in df_plot.columns
-            
             if has_timestamp:
-                x_data = df_plot['timestamp']
+                x_data = data['ts_num']
                 ax3.set_xlabel('Time')
             else:
-                x_data = df_plot.index
+                x_data = np.arange(offset, offset + n)
                 ax3.set_xlabel('Sample Index')
             
-            ax1.plot(x_data, df_plot['x'], 'b-', linewidth=0.5)
-            ax1.set_ylabel('X-axis (g)')
-            
-            ax2.plot(x_data, df_plot['y'], 'g-', linewidth=0.5)
-            ax2.set_ylabel('Y-axis (g)')
-            
-            ax3.plot(x_data, df_plot['z'], 'r-', linewidth=0.5)
-            ax3.set_ylabel('Z-axis (g)')
+            # 화면 폭 기준으로 min/max 버킷팅 후 축마다 LineCollection 하나로 플롯
+            n_buckets = self._n_buckets()
+            for ax, values, color, label in ((ax1, x, 'b', 'X-axis (g)'),
+                                             (ax2, y, 'g', 'Y-axis (g)'),
+                                             (ax3, z, 'r', 'Z-axis (g)')):
+                ax.add_collection(_line_segments(*_minmax_bucket(x_data, values, n_buckets), color))
+                ax.autoscale_view()
+                ax.set_ylabel(label)
             
             ax1.set_title('Accelerometer Data')
             
@@ -179,16 +389,16 @@ class PlotCanvas(FigureCanvas):
         elif plot_type == 'magnitude':
             # 진폭 플롯
             ax = self.fig.add_subplot(111)
-            magnitude = np.sqrt(df_plot['x']**2 + df_plot['y']**2 + df_plot['z']**2)
-            
-            has_timestamp = 'timestamp' in df_plot.columns
+            magnitude = np.empty(n, dtype=np.float32)
+            _mag(x, y, z, magnitude)
             
             if has_timestamp:
-                ax.plot(df_plot['timestamp'], magnitude, 'k-', linewidth=0.5)
+                x_data = data['ts_num']
                 ax.set_xlabel('Time')
             else:
-                ax.plot(df_plot.index, magnitude, 'k-', linewidth=0.5)
+                x_data = np.arange(offset, offset + n)
                 ax.set_xlabel('Sample Index')
+            ax.plot(*_minmax_bucket(x_data, magnitude, self._n_buckets()), 'k-', linewidth=0.5)
             
             ax.set_ylabel('Magnitude (g)')
             ax.set_title('Accelerometer Magnitude')
@@ -202,13 +412,18 @@ class PlotCanvas(FigureCanvas):
             
             ax = self.fig.add_subplot(111)
             
+            # 세 축을 (3, N) float32 배열로 쌓아 스펙트럼을 한 번에 계산
+            arr = np.stack([x.astype(np.float32, copy=False),
+                            y.astype(np.float32, copy=False),
+                            z.astype(np.float32, copy=False)], axis=0)
+            f, Pxx = signal.welch(arr, 
+                                 fs=1666,  # 샘플링 레이트
+                                 nperseg=min(4096, n//4),
+                                 axis=1)
+            
             # 각 축별 스펙트럼
             for i, (axis, color) in enumerate([('x', 'b'), ('y', 'g'), ('z', 'r')]):
-                # 스펙트럼 계산
-                f, Pxx = signal.welch(df_plot[axis].values, 
-                                     fs=1666,  # 샘플링 레이트
-                                     nperseg=min(4096, len(df_plot)//4))
-                ax.semilogy(f, Pxx, color=color, label=f'{axis.upper()}-axis', alpha=0.7)
+                ax.semilogy(f, Pxx[i], color=color, label=f'{axis.upper()}-axis', alpha=0.7)
             
             ax.set_xlabel('Frequency (Hz)')
             ax.set_ylabel('Power Spectral Density')
@@ -217,27 +432,23 @@ class PlotCanvas(FigureCanvas):
             ax.grid(True, alpha=0.3)
             ax.set_xlim(0, 833)  # 나이퀴스트 주파수까지
     
-    def _plot_mic_data(self, df, plot_type, time_range=None):
-        """마이크 데이터 플롯"""
-        # 시간 범위 필터링
-        if time_range and 'timestamp' in df.columns:
-            mask = (df.index >= time_range[0]) & (df.index <= time_range[1])
-            df_plot = df.loc[mask]
-        else:
-            df_plot = df
+    def _plot_mic_data(self, data, plot_type, offset=0):
+        """마이크 데이터 플롯 (data: 시간 범위로 잘라 둔 배열 뷰, offset: 시작 샘플 번호)"""
+        mic = data['mic_value']
+        n = len(mic)
+        has_timestamp = 'timestamp' in data
         
         if plot_type == 'time':
             # 시계열 플롯
             ax = self.fig.add_subplot(111)
             
-            has_timestamp = 'timestamp' in df_plot.columns
-            
             if has_timestamp:
-                ax.plot(df_plot['timestamp'], df_plot['mic_value'], 'b-', linewidth=0.5)
+                x_data = data['ts_num']
                 ax.set_xlabel('Time')
             else:
-                ax.plot(df_plot.index, df_plot['mic_value'], 'b-', linewidth=0.5)
+                x_data = np.arange(offset, offset + n)
                 ax.set_xlabel('Sample Index')
+            ax.plot(*_minmax_bucket(x_data, mic, self._n_buckets()), 'b-', linewidth=0.5)
             
             ax.set_ylabel('Amplitude')
             ax.set_title('Microphone Data')
@@ -251,10 +462,10 @@ class PlotCanvas(FigureCanvas):
             
             ax = self.fig.add_subplot(111)
             
-            # 스펙트럼 계산
-            f, Pxx = signal.welch(df_plot['mic_value'].values, 
+            # 스펙트럼 계산 (float32로 FFT 연산량/메모리 절반)
+            f, Pxx = signal.welch(mic.astype(np.float32, copy=False), 
                                  fs=8000,  # 샘플링 레이트
-                                 nperseg=min(8192, len(df_plot)//4))
+                                 nperseg=min(8192, n//4))
             ax.semilogy(f, Pxx, 'b-')
             
             ax.set_xlabel('Frequency (Hz)')
@@ -265,27 +476,41 @@ class PlotCanvas(FigureCanvas):
             
         elif plot_type == 'spectrogram':
             # 스펙트로그램
-            from scipy import signal
+            from scipy import fft, signal
             
             ax = self.fig.add_subplot(111)
             
-            # 스펙트로그램 계산
-            f, t, Sxx = signal.spectrogram(df_plot['mic_value'].values, 
-                                          fs=8000,
-                                          nperseg=min(512, len(df_plot)//8))
+            # 스펙트로그램 계산 (signal.spectrogram과 같은 창/겹침/평균 제거, FFT는 float32로 수행)
+            # 프레임은 strided 뷰에서 한 번만 복사하고 평균 제거와 창 적용은 그 버퍼에서 제자리로 처리
+            fs = 8000
+            nperseg = min(512, n//8)
+            hop = nperseg - nperseg // 8  # signal.spectrogram 기본 겹침과 동일
+            win = signal.get_window(('tukey', .25), nperseg).astype(np.float32)  # signal.spectrogram 기본 창
+            frames = np.lib.stride_tricks.sliding_window_view(mic.astype(np.float32, copy=False), nperseg)[::hop]
+            frames = frames - frames.mean(axis=1, keepdims=True)
+            frames *= win
+            Sxx = np.abs(fft.rfft(frames, axis=1, workers=-1)) ** 2
+            # PSD 스케일 (단측 스펙트럼이므로 DC/나이퀴스트 외 성분은 2배)
+            Sxx /= fs * np.sum(win * win)
+            Sxx[:, 1:(nperseg + 1) // 2] *= 2
+            Sxx = Sxx.T
+            f = np.fft.rfftfreq(nperseg, 1 / fs)
+            t = (np.arange(Sxx.shape[1]) * hop + nperseg / 2) / fs
             
             # 로그 스케일로 변환
             Sxx_db = 10 * np.log10(Sxx + 1e-10)
             
             # 시간 축을 timestamp로 변환 (있는 경우)
-            if 'timestamp' in df_plot.columns:
+            if has_timestamp:
                 # 시작 시간
-                start_time = df_plot['timestamp'].iloc[0]
-                # 시간 배열을 datetime으로 변환
-                time_stamps = [start_time + timedelta(seconds=float(t_val)) for t_val in t]
+                start_time = pd.Timestamp(data['timestamp'][0])
+                # 시간 배열을 matplotlib 날짜 숫자(일 단위)로 바로 변환
+                x = mdates.date2num(start_time.to_pydatetime()) + t.astype(np.float64) / 86400.0
                 
-                im = ax.pcolormesh(mdates.date2num(time_stamps), f, Sxx_db, 
-                                  shading='gouraud', cmap='viridis')
+                # 격자가 균일하므로 pcolormesh 대신 이미지 한 장으로 그림
+                im = ax.imshow(Sxx_db, aspect='auto', origin='lower',
+                               extent=[x[0], x[-1], f[0], f[-1]],
+                               cmap='viridis', interpolation='nearest')
                 
                 # 시간 축 포맷 적용
                 ax.xaxis.set_major_locator(mdates.MinuteLocator(interval=30))
@@ -294,7 +519,9 @@ class PlotCanvas(FigureCanvas):
                 plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
                 ax.set_xlabel('Time')
             else:
-                im = ax.pcolormesh(t, f, Sxx_db, shading='gouraud', cmap='viridis')
+                im = ax.imshow(Sxx_db, aspect='auto', origin='lower',
+                               extent=[t[0], t[-1], f[0], f[-1]],
+                               cmap='viridis', interpolation='nearest')
                 ax.set_xlabel('Time (s)')
             
             ax.set_ylabel('Frequency (Hz)')
@@ -313,7 +540,7 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1400, 900)
         
         # 데이터 저장
-        self.df = None
+        self.data = None
         self.metadata = None
         
         # UI 초기화
@@ -384,7 +611,7 @@ class MainWindow(QMainWindow):
     def load_file(self):
         """CSV 파일 로드"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "CSV 파일 선택", "", "CSV 파일 (*.csv);;모든 파일 (*.*)"
+            self, "CSV/DAT 파일 선택", "", "CSV/DAT 파일 (*.csv *.dat);;CSV 파일 (*.csv);;DAT 파일 (*.dat);;모든 파일 (*.*)"
         )
         
         if file_path:
@@ -398,26 +625,30 @@ class MainWindow(QMainWindow):
             self.loader.error.connect(self.on_load_error)
             self.loader.start()
     
-    def on_data_loaded(self, df, metadata):
+    def on_data_loaded(self, data, metadata):
         """데이터 로드 완료"""
-        self.df = df
+        self.data = data
         self.metadata = metadata
         
+        # matplotlib 날짜 숫자(일 단위 float)로 한 번만 변환해 두고 매 플롯마다 재사용
+        if 'timestamp' in data:
+            data['ts_num'] = mdates.date2num(data['timestamp'])
+        
         # UI 업데이트
         self.file_label.setText(f"로드 완료: {metadata['loaded_rows']:,}개 행")
         self.load_button.setEnabled(True)
         
         # 정보 표시
         info_text = f"센서 타입: {metadata['sensor_type']} | "
-        info_text += f"전체 행: {metadata['total_rows']:,} | "
+        info_text += f"전체 행(추정): ~{metadata['total_rows_estimate']:,} | "
         info_text += f"로드된 행: {metadata['loaded_rows']:,} | "
         if metadata['downsample_rate'] > 1:
             info_text += f"다운샘플링: 1/{metadata['downsample_rate']}"
         
         # 시간 범위 정보 추가
-        if 'timestamp' in df.columns:
-            start_time = df['timestamp'].min()
-            end_time = df['timestamp'].max()
+        if 'timestamp' in data:
+            start_time = pd.Timestamp(data['timestamp'].min())
+            end_time = pd.Timestamp(data['timestamp'].max())
             duration = end_time - start_time
             info_text += f" | 시간 범위: {start_time.strftime('%H:%M')} ~ {end_time.strftime('%H:%M')} ({duration})"
         
@@ -445,7 +676,7 @@ class MainWindow(QMainWindow):
     
     def update_plot(self):
         """플롯 업데이트"""
-        if self.df is None:
+        if self.data is None:
             return
         
         plot_type_map = {
@@ -459,20 +690,22 @@ class MainWindow(QMainWindow):
         
         # 시간 범위 계산
         range_percent = self.range_slider.value() / 100
-        if range_percent < 1.0:
-            total_samples = len(self.df)
-            end_idx = int(total_samples * range_percent)
-            time_range = (0, end_idx)
+        if range_percent < 1.0 and 'ts_num' in self.data:
+            # 시작 시각부터 전체 시간 길이의 range_percent 만큼
+            ts = self.data['ts_num']
+            t0 = ts[0]
+            t1 = t0 + (ts[-1] - t0) * range_percent
+            time_range = (t0, t1)
         else:
             time_range = None
         
-        self.canvas.plot_data(self.df, self.metadata, plot_type, time_range)
+        self.canvas.plot_data(self.data, self.metadata, plot_type, time_range)
         self.update_status("플롯 완료")
     
     def update_time_range(self, value):
         """시간 범위 슬라이더 업데이트"""
         self.range_label.setText(f"{value}%")
-        if self.df is not None:
+        if self.data is not None:
             self.update_plot()
 
 
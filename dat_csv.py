@@ -2,14 +2,221 @@
 # dat_to_csv_gui.py - DAT → CSV 변환 GUI 프로그램
 
 import os
+import asyncio
 import sys
+import time
 import numpy as np
+import numba
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                              QRadioButton, QButtonGroup, QFileDialog, QSpinBox, 
                              QTextEdit, QGroupBox, QFormLayout, QProgressBar)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
+
+def _write_csv_fast(path, header, body):
+    """헤더와 미리 포맷한 CSV 본문(bytes 계열)을 파일에 한 번에 기록"""
+    # 헤더와 본문이 write() 호출로 잘게 나뉘지 않도록 1MB 버퍼 사용
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.write((header + '\n').encode('ascii'))
+        f.write(body)
+
+
+@numba.njit(cache=True, inline='always')
+def _put_uint(buf, pos, v):
+    """0 이상의 정수 v를 10진 ASCII로 buf[pos:]에 기록하고 다음 위치 반환"""
+    if v == 0:
+        buf[pos] = 48
+        return pos + 1
+    start = pos
+    while v > 0:
+        buf[pos] = 48 + v % 10
+        v //= 10
+        pos += 1
+    # 낮은 자리부터 썼으므로 뒤집기
+    end = pos - 1
+    while start < end:
+        buf[start], buf[end] = buf[end], buf[start]
+        start += 1
+        end -= 1
+    return pos
+
+
+@numba.njit(cache=True, inline='always')
+def _put_micro(buf, pos, k):
+    """k × 1e-6 값을 '%.6f' 형식으로 기록 (정수 연산만 사용하므로 반올림 오차 없음)"""
+    if k < 0:
+        buf[pos] = 45  # '-'
+        pos += 1
+        k = -k
+    pos = _put_uint(buf, pos, k // 1000000)
+    buf[pos] = 46  # '.'
+    frac = k % 1000000
+    for d in range(6, 0, -1):
+        buf[pos + d] = 48 + frac % 10
+        frac //= 10
+    return pos + 7
+
+
+@numba.njit(cache=True)
+def _acc_format(rec, n, t_buf, t_off, out):
+    """ACC 레코드 뷰(세트×3000 int16)를 'time,x,y,z' CSV 행으로 out에 바로 기록하고 길이 반환
+    
+    스케일 0.000488 = 488e-6이므로 raw×488을 마이크로 단위 정수로 포맷하면
+    float64로 곱한 뒤 '%.6f'로 찍은 결과와 모든 int16 값에서 같음
+    """
+    pos = 0
+    for i in range(n):
+        # 시간 컬럼은 미리 포맷해 둔 바이트를 복사
+        for b in range(t_off[i], t_off[i + 1]):
+            out[pos] = t_buf[b]
+            pos += 1
+        r = i // 1000
+        j = (i % 1000) * 3
+        for c in range(3):
+            out[pos] = 44  # ','
+            pos = _put_micro(out, pos + 1, np.int64(rec[r, j + c]) * 488)
+        out[pos] = 10  # '\n'
+        pos += 1
+    return pos
+
+
+@numba.njit(cache=True)
+def _mic_format(rec, n, t_buf, t_off, out):
+    """MIC 레코드 뷰(세트×1000 int16)를 'time,mic_value' CSV 행으로 out에 바로 기록하고 길이 반환"""
+    pos = 0
+    for i in range(n):
+        for b in range(t_off[i], t_off[i + 1]):
+            out[pos] = t_buf[b]
+            pos += 1
+        out[pos] = 44  # ','
+        pos += 1
+        v = np.int64(rec[i // 1000, i % 1000])
+        if v < 0:
+            out[pos] = 45  # '-'
+            pos += 1
+            v = -v
+        pos = _put_uint(out, pos, v)
+        out[pos] = 10  # '\n'
+        pos += 1
+    return pos
+
+
+# 한 행에서 시간 컬럼 외 최대 바이트 수 (ACC: ',-15.990784' × 3 + '\n')
+_MAX_ROW_EXTRA = 3 * 11 + 1
+
+# DAT 레코드 구조 (NumPy가 푸터를 건너뛰는 stride를 직접 처리)
+# ACC: 1000샘플×3축 int16(6000바이트) + 8바이트 푸터, MIC: 1000샘플 int16(2000바이트) + 8바이트 푸터
+_ACC_RECORD = np.dtype([('samples', np.int16, (1000, 3)), ('_pad', np.int8, 8)])
+_MIC_RECORD = np.dtype([('samples', np.int16, 1000), ('_pad', np.int8, 8)])
+
+# 작업 프로세스마다 한 번 만드는 상태 (배치 내 모든 파일이 같은 센서/샘플링 레이트/윈도우)
+# - 시간 컬럼: '%.6f'로 미리 포맷해 이어 붙인 바이트와 행별 시작 위치 (파일마다 다시 포맷하지 않음)
+# - 레코드/출력 버퍼: 파일마다 새로 할당하지 않고 같은 프로세스 안에서 재사용
+_times_buf = None
+_times_off = None
+_rec_buf = None
+_out_buf = None
+
+
+def _init_worker(sensor_type, sampling_rate, window_sec):
+    """작업 프로세스 시작 시 시간 컬럼과 버퍼를 만들고 numba 커널을 미리 컴파일(또는 캐시 로드)"""
+    global _times_buf, _times_off, _rec_buf, _out_buf
+    n = sampling_rate * window_sec
+    times = np.arange(n, dtype=np.float64) / sampling_rate
+    text = ['%.6f' % t for t in times.tolist()]
+    _times_buf = np.frombuffer(''.join(text).encode('ascii'), dtype=np.uint8)
+    _times_off = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in text], out=_times_off[1:])
+    _rec_buf = np.empty((n + 999) // 1000, dtype=_ACC_RECORD if sensor_type == "ACC" else _MIC_RECORD)
+    _out_buf = np.empty(_times_off[n] + n * _MAX_ROW_EXTRA, dtype=np.uint8)
+    warm = np.empty(64, dtype=np.uint8)
+    _acc_format(np.zeros((1, 3000), dtype=np.int16), 1, warm, np.zeros(2, dtype=np.int64), warm)
+    _mic_format(np.zeros((1, 1000), dtype=np.int16), 1, warm, np.zeros(2, dtype=np.int64), warm)
+
+
+def _read_records(dat_path, record, sets, out=None):
+    """DAT에서 레코드 sets개를 한 번에 읽음 (out이 있으면 그 버퍼에 채움)"""
+    # 청크마다 fromfile+seek 하지 않고 필요한 레코드를 한 번에 읽음 (한 번 읽으므로 버퍼 없는 raw IO)
+    with open(dat_path, 'rb', buffering=0) as f:
+        # 크기가 모자란 파일은 버퍼 할당/읽기 전에 바로 실패 처리
+        expected = sets * record.itemsize
+        actual = os.fstat(f.fileno()).st_size
+        if actual < expected:
+            raise ValueError(f"불완전 DAT: {actual} < {expected} 바이트")
+        if out is None:
+            recs = np.fromfile(f, dtype=record, count=sets)
+        else:
+            recs = out[:sets]
+            recs = recs[:f.readinto(recs.view(np.uint8)) // record.itemsize]
+    if len(recs) < sets:
+        raise ValueError(f"불완전 DAT: 청크{len(recs)}에서 중단 ({len(recs)}/{sets} 레코드)")
+    return recs
+
+
+def load_dat_file_acc(dat_path, sampling_rate, window_sec, out=None):
+    """ACC용 DAT을 읽어 (레코드별 int16 샘플 뷰 (세트×3000), 샘플 수) 반환
+    
+    out: 재사용할 _ACC_RECORD 버퍼 (없으면 새로 할당)
+    """
+    samples_needed = sampling_rate * window_sec
+    sets = (samples_needed + 999) // 1000
+    recs = _read_records(dat_path, _ACC_RECORD, sets, out)
+    # 푸터를 건너뛰는 int16 stride 뷰 (복사 없음)
+    return recs['samples'].reshape(sets, 3000), samples_needed
+
+
+def load_dat_file_mic(dat_path, sampling_rate, window_sec, out=None):
+    """MIC용 DAT을 읽어 (레코드별 int16 샘플 뷰 (세트×1000), 샘플 수) 반환
+    
+    out: 재사용할 _MIC_RECORD 버퍼 (없으면 새로 할당)
+    """
+    samples_needed = sampling_rate * window_sec
+    sets = (samples_needed + 999) // 1000
+    recs = _read_records(dat_path, _MIC_RECORD, sets, out)
+    # 푸터를 건너뛰는 int16 stride 뷰 (복사 없음)
+    return recs['samples'], samples_needed
+
+
+def _convert_one(sensor_type, sampling_rate, window_sec, dat_path, csv_path):
+    """DAT 파일 하나를 CSV로 변환 (작업 프로세스에서 실행) → (성공 여부, 오류 메시지)"""
+    try:
+        # 읽기 → 스케일링 → 텍스트 변환을 커널 한 번으로 처리해 CSV 본문 바이트를 바로 만듦
+        # (레코드/출력 버퍼는 프로세스별로 재사용, 다음 파일 전에 기록이 끝나므로 안전)
+        if sensor_type == "ACC":
+            rec, n = load_dat_file_acc(dat_path, sampling_rate, window_sec, out=_rec_buf)
+            header = 'time_sec,x,y,z'
+            size = _acc_format(rec, n, _times_buf, _times_off, _out_buf)
+        else:  # MIC
+            rec, n = load_dat_file_mic(dat_path, sampling_rate, window_sec, out=_rec_buf)
+            header = 'time_sec,mic_value'
+            # time은 소수점 6자리까지, mic 값은 정수형으로 저장
+            size = _mic_format(rec, n, _times_buf, _times_off, _out_buf)
+        _write_csv_fast(csv_path, header, memoryview(_out_buf)[:size])
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def _iter_dats(root):
+    """root 아래 .dat 파일 경로를 재귀적으로 생성 (os.walk처럼 폴더의 파일 먼저, 그다음 하위 폴더)
+    
+    DirEntry의 이름/타입 정보만 쓰므로 항목마다 stat을 따로 호출하지 않음
+    """
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    subdirs = []
+    for e in entries:
+        if e.is_dir(follow_symlinks=False):
+            subdirs.append(e.path)
+        elif e.name.lower().endswith('.dat') and e.is_file():
+            yield e.path
+    for d in subdirs:
+        yield from _iter_dats(d)
+
+
 class ConversionWorker(QThread):
     """변환 작업을 백그라운드에서 실행하는 클래스"""
     progress_signal = pyqtSignal(str)
@@ -22,118 +229,123 @@ class ConversionWorker(QThread):
         self.sampling_rate = sampling_rate
         self.window_sec = window_sec
         self.is_directory = is_directory  # 폴더 모드 여부
-        
-    def load_dat_file_acc(self, dat_path, sampling_rate, window_sec):
-        """ACC용 DAT을 읽어 float64 2D np.ndarray (N×3) 반환"""
-        samples_needed = sampling_rate * window_sec
-        data = np.empty((samples_needed, 3), dtype=np.int16)
-        with open(dat_path, 'rb') as f:
-            sets = (samples_needed + 999) // 1000
-            total = 0
-            for i in range(sets):
-                chunk = np.fromfile(f, dtype=np.int16, count=3000)
-                if len(chunk) < 3000:
-                    raise ValueError(f"불완전 DAT: 청크{i}에서 {len(chunk)}개 읽음")
-                chunk = chunk.reshape(-1, 3)
-                csize = min(1000, samples_needed - total)
-                data[total:total+csize, :] = chunk[:csize, :]
-                total += csize
-                f.seek(8, 1)
-        return data.astype(np.float64) * 0.000488  # 스케일링
+        # 파일별 로그는 모아서 한 번에 전달 (파일마다 시그널 + QTextEdit 갱신하면 느림)
+        self._log_buf = []
+        self._last_emit = time.monotonic()
+    
+    def _log(self, line):
+        """로그 한 줄 추가 (64줄 또는 0.1초마다 묶어서 progress_signal 전송)"""
+        self._log_buf.append(line)
+        now = time.monotonic()
+        if len(self._log_buf) >= 64 or now - self._last_emit > 0.1:
+            self._flush_log()
+    
+    def _flush_log(self):
+        """모아 둔 로그를 한 번에 전송"""
+        if self._log_buf:
+            self.progress_signal.emit('\n'.join(self._log_buf))
+            self._log_buf.clear()
+        self._last_emit = time.monotonic()
     
-    def load_dat_file_mic(self, dat_path, sampling_rate, window_sec):
-        """MIC용 DAT을 읽어 float64 1D np.ndarray 반환"""
-        samples_needed = sampling_rate * window_sec
-        buf = np.empty(samples_needed, dtype=np.int16)
-        with open(dat_path, 'rb') as f:
-            sets = samples_needed // 1000
-            for i in range(sets):
-                chunk = np.fromfile(f, dtype=np.int16, count=1000)
-                if len(chunk) < 1000:
-                    raise ValueError(f"불완전 DAT: 청크{i}에서 {len(chunk)}개 읽음")
-                buf[i*1000:(i+1)*1000] = chunk
-                f.seek(8, 1)  # 8바이트 스킵
-        return buf.astype(np.int16)
+    def _folder_tasks(self, dat_dir):
+        """폴더 모드 작업 생성 → (DAT 경로, CSV 경로, 로그용 입력 이름, 로그용 출력 이름)"""
+        csv_dirs = {}  # 폴더 → csv 폴더 (DAT이 처음 나온 폴더에서만 생성)
+        for dat_path in _iter_dats(dat_dir):
+            root, fname = os.path.split(dat_path)
+            csv_dir = csv_dirs.get(root)
+            if csv_dir is None:
+                csv_dir = os.path.join(root, 'csv')
+                os.makedirs(csv_dir, exist_ok=True)
+                csv_dirs[root] = csv_dir
+            csv_path = os.path.join(csv_dir, os.path.splitext(fname)[0] + '.csv')
+            yield (dat_path, csv_path,
+                   os.path.relpath(dat_path, dat_dir), os.path.relpath(csv_path, dat_dir))
+    
+    def _report(self, result, src_name, dst_name):
+        """변환 결과 (성공 여부, 오류 메시지)를 로그로 출력하고 성공 여부 반환"""
+        ok, err = result
+        if ok:
+            self._log(f"   ✅ {src_name} → {dst_name}")
+        else:
+            self._log(f"   ❌ 실패: {src_name} ({err})")
+        return ok
+    
+    async def run_async(self, tasks):
+        """작업을 프로세스 풀로 넘기고 결과를 제출 순서대로 기록하는 asyncio 펌프 → (성공 수, 실패 수)
+        
+        탐색으로 작업이 생기는 대로 제출하고, 풀에 걸려 있는 작업은 워커 수의 2배까지만 유지
+        (한 워커가 CSV를 쓰는 동안 다른 워커는 다음 DAT을 읽음)
+        """
+        loop = asyncio.get_running_loop()
+        workers = os.cpu_count() or 1
+        success_count = 0
+        fail_count = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.sensor_type, self.sampling_rate, self.window_sec)) as ex:
+            pending = deque()
+            for dat_path, csv_path, src_name, dst_name in tasks:
+                future = loop.run_in_executor(ex, _convert_one, self.sensor_type, self.sampling_rate,
+                                              self.window_sec, dat_path, csv_path)
+                pending.append((future, src_name, dst_name))
+                if len(pending) >= 2 * workers:
+                    future, src_name, dst_name = pending.popleft()
+                    if self._report(await future, src_name, dst_name):
+                        success_count += 1
+                    else:
+                        fail_count += 1
+            while pending:
+                future, src_name, dst_name = pending.popleft()
+                if self._report(await future, src_name, dst_name):
+                    success_count += 1
+                else:
+                    fail_count += 1
+        return success_count, fail_count
     
     def run(self):
         """변환 작업 실행"""
         try:
             success_count = 0
             fail_count = 0
+            # (DAT 경로, CSV 경로, 로그용 입력 이름, 로그용 출력 이름)
+            tasks = []
             
             if self.is_directory:
-                # 폴더 모드 - 재귀적으로 처리
+                # 폴더 모드 - 재귀적으로 처리 (탐색하면서 바로 작업을 넘김)
                 dat_dir = self.dat_paths
                 self.progress_signal.emit(f"▶️ {self.sensor_type} 변환 시작 (재귀 탐색): {dat_dir}")
-                
-                for root, _, files in os.walk(dat_dir):
-                    dats = [f for f in files if f.lower().endswith('.dat')]
-                    if not dats:
-                        continue
-                    
-                    csv_dir = os.path.join(root, 'csv')
-                    os.makedirs(csv_dir, exist_ok=True)
-                    
-                    for fname in sorted(dats):
-                        dat_path = os.path.join(root, fname)
-                        try:
-                            if self.sensor_type == "ACC":
-                                data = self.load_dat_file_acc(dat_path, self.sampling_rate, self.window_sec)
-                                n = data.shape[0]
-                                times = np.arange(n) / self.sampling_rate
-                                out = np.column_stack((times, data))
-                                header = 'time_sec,x,y,z'
-                                np.savetxt(os.path.join(csv_dir, os.path.splitext(fname)[0] + '.csv'), out, delimiter=',', header=header, comments='', fmt=['%.6f', '%.6f', '%.6f', '%.6f'])
-                            else:  # MIC
-                                data = self.load_dat_file_mic(dat_path, self.sampling_rate, self.window_sec)
-                                n = data.shape[0]
-                                times = np.arange(n) / self.sampling_rate
-                                out = np.column_stack((times, data))
-                                header = 'time_sec,mic_value'
-                                # time은 소수점 6자리까지, mic 값은 정수형으로 저장
-                                np.savetxt(os.path.join(csv_dir, os.path.splitext(fname)[0] + '.csv'), out, delimiter=',', header=header, comments='', fmt=['%.6f', '%d'])
-                            success_count += 1
-                            self.progress_signal.emit(f"   ✅ {os.path.relpath(dat_path, dat_dir)} → {os.path.relpath(os.path.join(csv_dir, os.path.splitext(fname)[0] + '.csv'), dat_dir)}")
-                        except Exception as e:
-                            fail_count += 1
-                            self.progress_signal.emit(f"   ❌ 실패: {os.path.relpath(dat_path, dat_dir)} ({e})")
+                tasks = self._folder_tasks(dat_dir)
             else:
                 # 파일 모드 - 선택된 파일들만 처리
                 self.progress_signal.emit(f"▶️ {self.sensor_type} 변환 시작 (선택된 파일): {len(self.dat_paths)}개")
                 
+                created = set()  # 이미 만든 csv 폴더 (같은 폴더의 파일이 많을 때 makedirs 반복 방지)
                 for dat_path in self.dat_paths:
+                    fname = os.path.basename(dat_path)
                     try:
                         # 출력 폴더는 입력 파일과 같은 위치의 'csv' 폴더
                         file_dir = os.path.dirname(dat_path)
                         csv_dir = os.path.join(file_dir, 'csv')
-                        os.makedirs(csv_dir, exist_ok=True)
-                        
-                        fname = os.path.basename(dat_path)
-                        
-                        if self.sensor_type == "ACC":
-                            data = self.load_dat_file_acc(dat_path, self.sampling_rate, self.window_sec)
-                            n = data.shape[0]
-                            times = np.arange(n) / self.sampling_rate
-                            out = np.column_stack((times, data))
-                            header = 'time_sec,x,y,z'
-                            np.savetxt(os.path.join(csv_dir, os.path.splitext(fname)[0] + '.csv'), out, delimiter=',', header=header, comments='', fmt=['%.6f', '%.6f', '%.6f', '%.6f'])
-                        else:  # MIC
-                            data = self.load_dat_file_mic(dat_path, self.sampling_rate, self.window_sec)
-                            n = data.shape[0]
-                            times = np.arange(n) / self.sampling_rate
-                            out = np.column_stack((times, data))
-                            header = 'time_sec,mic_value'
-                            # time은 소수점 6자리까지, mic 값은 정수형으로 저장
-                            np.savetxt(os.path.join(csv_dir, os.path.splitext(fname)[0] + '.csv'), out, delimiter=',', header=header, comments='', fmt=['%.6f', '%d'])
-                        success_count += 1
-                        self.progress_signal.emit(f"   ✅ {fname} → {os.path.join('csv', os.path.splitext(fname)[0] + '.csv')}")
+                        if csv_dir not in created:
+                            os.makedirs(csv_dir, exist_ok=True)
+                            created.add(csv_dir)
                     except Exception as e:
                         fail_count += 1
-                        self.progress_signal.emit(f"   ❌ 실패: {fname} ({e})")
+                        self._log(f"   ❌ 실패: {fname} ({e})")
+                        continue
+                    csv_name = os.path.splitext(fname)[0] + '.csv'
+                    tasks.append((dat_path, os.path.join(csv_dir, csv_name),
+                                  fname, os.path.join('csv', csv_name)))
+            
+            # 파일끼리는 독립적이므로 코어 수만큼 프로세스로 나눠 변환 (QThread 안에서 asyncio 루프 구동)
+            ok_count, ng_count = asyncio.run(self.run_async(tasks))
+            success_count += ok_count
+            fail_count += ng_count
             
+            self._flush_log()
             mode_str = "폴더" if self.is_directory else "파일"
             self.finished_signal.emit(True, f"✅ {self.sensor_type} 전체 변환 완료 ({mode_str} 모드): 성공 {success_count}개, 실패 {fail_count}개")
         except Exception as e:
+            self._flush_log()
             self.finished_signal.emit(False, f"❌ 변환 중 오류 발생: {str(e)}")
 
 
@@ -293,7 +505,7 @@ class MainWindow(QMainWindow):
             self.rate_input.setValue(8000)
     
     def log_message(self, message):
-        """로그 메시지 추가"""
+        """로그 메시지 추가 (여러 줄을 묶은 메시지도 한 번에 추가)"""
         self.log_text.append(message)
         # 자동 스크롤
         scrollbar = self.log_text.verticalScrollBar()
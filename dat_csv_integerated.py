@@ -2,10 +2,19 @@
 # dat_to_integrated_csv_gui.py - DAT → 통합 CSV 변환 GUI 프로그램
 
 import os
+import re
 import sys
+import time
 import numpy as np
+import numba
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from datetime import datetime
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                              QRadioButton, QButtonGroup, QFileDialog, QSpinBox, 
@@ -13,111 +22,327 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QCheckBox, QComboBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
+
+def _write_columns_csv(path, columns, fmts, header, block_rows=65536):
+    """숫자 컬럼들을 CSV로 저장 (np.savetxt와 같은 출력, 행 단위 포맷팅 없이 블록 단위로 한 번에 포맷)"""
+    n = len(columns[0])
+    k = len(columns)
+    row_fmt = ','.join(fmts) + '\n'
+    # 블록마다 write()가 잘게 나뉘지 않도록 1MB 버퍼 사용
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.write((header + '\n').encode('ascii'))
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            # 컬럼 값을 행 순서로 펼친 뒤 블록 전체를 문자열 포맷 한 번으로 변환
+            flat = [None] * ((stop - start) * k)
+            for i, col in enumerate(columns):
+                flat[i::k] = col[start:stop].tolist()
+            f.write((row_fmt * (stop - start) % tuple(flat)).encode('ascii'))
+
+
+def _read_sets(dat_path, record_bytes):
+    """DAT 파일의 완전한 세트들을 (세트, record_bytes) uint8 배열로 읽음
+    
+    크기는 열린 파일의 fstat으로 얻고 (경로 stat 추가 없음) 미리 할당한 버퍼에 readinto로 바로 읽음
+    → 파일당 open + fstat + read + close 만 수행
+    record_bytes에 못 미치는 마지막 조각은 기존과 같이 버림
+    """
+    with open(dat_path, 'rb', buffering=0) as f:
+        sets = os.fstat(f.fileno()).st_size // record_bytes
+        raw = np.empty((sets, record_bytes), dtype=np.uint8)
+        view = memoryview(raw.reshape(-1))
+        got = 0
+        while got < raw.size:
+            k = f.readinto(view[got:])
+            if not k:
+                break
+            got += k
+    # 읽는 도중 파일이 줄어든 경우 끝까지 읽은 세트만 사용
+    return raw[:got // record_bytes]
+
+
+_ACC_SCALE = np.float32(0.000488)
+
+
+# parallel=True(workqueue 스레드)는 개별 변환의 프로세스 풀이 fork한 뒤 종료 시 멈추므로 쓰지 않음
+# 병렬화는 파일 단위(프로세스/스레드 풀)로 하고, nogil로 스레드 풀에서도 동시에 실행 가능
+@numba.njit(nogil=True, fastmath=True, cache=True)
+def _scale_acc(src, dst, scale):
+    """int16 (세트, 1000, 3) → float32 (N, 3) 변환과 스케일링을 임시 배열 없이 한 번에 dst에 기록"""
+    for s in range(src.shape[0]):
+        base = s * 1000
+        for i in range(1000):
+            dst[base + i, 0] = np.float32(src[s, i, 0]) * scale
+            dst[base + i, 1] = np.float32(src[s, i, 1]) * scale
+            dst[base + i, 2] = np.float32(src[s, i, 2]) * scale
+
+
+def read_dat_file_acc_raw(dat_path):
+    """ACC용 DAT 파일 전체를 읽어 스케일링 전 int16 (세트, 1000, 3) 뷰 반환"""
+    # 각 세트는 3000개 int16 (6000바이트) + 8바이트 스킵 = 6008바이트
+    raw = _read_sets(dat_path, 6008)
+    # 8바이트 푸터를 잘라낸 뒤 int16으로 재해석 (복사 없음)
+    return raw[:, :6000].view(np.int16).reshape(len(raw), 1000, 3)
+
+
+def load_dat_file_acc(dat_path, sampling_rate):
+    """ACC용 DAT 파일 전체를 읽어 float32 2D np.ndarray (N×3) 반환"""
+    data = read_dat_file_acc_raw(dat_path)
+    # 16비트 센서 값이므로 float32로 충분 (메모리/연산량 절반)
+    out = np.empty((data.shape[0] * 1000, 3), dtype=np.float32)
+    _scale_acc(data, out, _ACC_SCALE)  # 스케일링
+    return out
+
+
+def load_dat_file_mic(dat_path, sampling_rate):
+    """MIC용 DAT 파일 전체를 읽어 int16 1D np.ndarray 반환"""
+    # 각 세트는 1000개 int16 (2000바이트) + 8바이트 스킵 = 2008바이트
+    raw = _read_sets(dat_path, 2008)
+    # 8바이트 푸터를 잘라낸 뒤 int16으로 재해석, 1차원으로 펼칠 때 한 번만 복사됨
+    return raw[:, :2000].view(np.int16).reshape(-1)
+
+
+@lru_cache(maxsize=8)
+def _relative_times(n, sampling_rate):
+    """개별 CSV의 time_sec 컬럼 (0부터 n개, 1/샘플링 레이트 간격)
+    
+    같은 크기의 파일이 대부분이므로 작업 프로세스마다 (n, 샘플링 레이트)별로 한 번만 계산해 재사용 (읽기 전용)
+    """
+    times = np.arange(n) / sampling_rate
+    times.setflags(write=False)
+    return times
+
+
+def _convert_one(sensor_type, sampling_rate, dat_path, csv_path):
+    """DAT 파일 하나를 개별 CSV로 변환 (작업 프로세스에서 실행) → (성공 여부, 오류 메시지)"""
+    try:
+        # 시간/값 컬럼을 하나의 배열로 합치지 않고 그대로 넘김 (column_stack 전체 복사 없음)
+        if sensor_type == "ACC":
+            data = load_dat_file_acc(dat_path, sampling_rate)
+            times = _relative_times(data.shape[0], sampling_rate)
+            header = 'time_sec,x,y,z'
+            _write_columns_csv(csv_path, (times, data[:, 0], data[:, 1], data[:, 2]),
+                            ['%.6f', '%.6f', '%.6f', '%.6f'], header)
+        else:  # MIC
+            data = load_dat_file_mic(dat_path, sampling_rate)
+            times = _relative_times(data.shape[0], sampling_rate)
+            header = 'time_sec,mic_value'
+            _write_columns_csv(csv_path, (times, data), ['%.6f', '%d'], header)
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def _iter_dats(root):
+    """root 아래 .dat 파일의 DirEntry를 재귀적으로 생성 (os.walk처럼 폴더의 파일 먼저, 그다음 하위 폴더)
+    
+    DirEntry의 이름/타입 정보만 쓰므로 항목마다 stat을 따로 호출하지 않고,
+    확장자는 이름 전체 대신 끝 4글자만 소문자로 비교
+    """
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    subdirs = []
+    for e in entries:
+        if e.is_dir():
+            # os.walk 기본값과 같이 심볼릭 링크 폴더는 따라가지 않음
+            if not e.is_symlink():
+                subdirs.append(e.path)
+        elif e.name[-4:].lower() == '.dat':
+            yield e
+    for d in subdirs:
+        yield from _iter_dats(d)
+
+
+# 파일명 앞부분 YYYYMMDD_HH_MM_SS (초 뒤는 '_' 또는 끝) - 모듈 로드 시 한 번만 컴파일
+_DT_PAT = re.compile(r'(\d{4})(\d{2})(\d{2})_(\d+)_(\d+)_(\d+)(?:_|$)', re.ASCII)
+
+
+@lru_cache(maxsize=None)
+def _parse_filename_datetime(filename):
+    """파일명에서 날짜/시간 추출 → datetime 또는 None (같은 이름은 캐시에서 바로 반환)"""
+    m = _DT_PAT.match(filename)
+    if m is None:
+        return None
+    year, month, day, hour, minute, second = map(int, m.groups())
+    # 시간 검증
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    try:
+        return datetime(year, month, day, hour, minute, second)
+    except ValueError:  # 존재하지 않는 날짜 (예: 13월, 2월 30일)
+        return None
+
+
+def _sample_times_ns(start, n, sampling_rate):
+    """시작 시각부터 n개 샘플의 절대 시간 (epoch ns, int64)
+    
+    시작 ns + i*1e9/sr 를 정수 연산으로 반올림 - pd.to_timedelta 변환 없음
+    """
+    return pd.Timestamp(start).value + (
+        np.arange(n, dtype=np.int64) * 1_000_000_000 + sampling_rate // 2) // sampling_rate
+
+
+class _IntegratedWriter:
+    """통합 결과를 DataFrame 청크 단위로 이어 쓰는 출력기 (CSV / NPY / Parquet)
+    
+    하루치 전체를 메모리에 모으지 않고 파일을 읽는 대로 기록할 수 있음
+    NPY/Parquet은 숫자를 텍스트로 바꾸지 않고 버퍼 그대로 기록하므로 대용량에서 CSV보다 훨씬 빠름
+    """
+    
+    def __init__(self, output_format, output_base, expected_rows):
+        self.output_format = output_format
+        self.output_base = output_base
+        self.output_file = f"{output_base}.{output_format}"
+        self.expected_rows = expected_rows  # NPY 헤더에 먼저 적는 행 수 (close에서 실제 값으로 고침)
+        self.rows = 0
+        self._header_written = False
+        self._file_ids = {}  # NPY: 파일명 → file_id
+        self._npy_dtype = None
+        self._schema = None      # CSV/Parquet: 첫 청크로 정한 Arrow 스키마
+        self._csv_writer = None
+        self._pq_writer = None
+        if output_format == 'parquet':
+            self._f = None
+        else:  # csv, npy - 청크 단위 기록이 작은 write()로 쪼개지지 않도록 1MB 버퍼 사용
+            self._f = open(self.output_file, 'wb', buffering=1 << 20)
+    
+    def write(self, df):
+        """청크 하나를 기록"""
+        if self.output_format == 'csv':
+            if df['timestamp'].dtype == object:
+                # 절대 시각과 상대 초가 섞인 컬럼은 Arrow 타입으로 나타낼 수 없으므로 pandas로 기록
+                df.to_csv(self._f, header=not self._header_written, index=False)
+            else:
+                self._write_csv(df)
+            self._header_written = True
+        else:
+            ts = df['timestamp']
+            if not pd.api.types.is_datetime64_any_dtype(ts):
+                # 파일명에서 시각을 얻지 못한 파일(상대 초)이 섞인 경우 바이너리 형식에서는 NaT로 저장
+                ts = pd.to_datetime(ts.where(ts.map(lambda v: isinstance(v, pd.Timestamp))))
+            if self.output_format == 'npy':
+                self._write_npy(df, ts)
+            else:
+                self._write_parquet(df.assign(timestamp=ts))
+        self.rows += len(df)
+    
+    def _npy_header(self, rows):
+        return {'descr': np.lib.format.dtype_to_descr(self._npy_dtype),
+                'fortran_order': False, 'shape': (rows,)}
+    
+    def _write_npy(self, df, ts):
+        value_cols = [c for c in df.columns if c not in ('timestamp', 'filename')]
+        if self._npy_dtype is None:
+            self._npy_dtype = np.dtype([('timestamp', '<i8')] +
+                                       [(c, df[c].dtype.str) for c in value_cols] + [('file_id', '<i4')])
+            np.lib.format.write_array_header_1_0(self._f, self._npy_header(self.expected_rows))
+        rec = np.empty(len(df), dtype=self._npy_dtype)
+        rec['timestamp'] = ts.values.astype('datetime64[ns]').view(np.int64)  # epoch ns
+        for c in value_cols:
+            rec[c] = df[c].values
+        # 파일명은 file_id(행별 정수)로 저장하고 목록은 close에서 텍스트 파일로 (줄 번호 = file_id)
+        names = df['filename'].cat
+        lut = np.array([self._file_ids.setdefault(name, len(self._file_ids)) for name in names.categories],
+                       dtype=np.int32)
+        rec['file_id'] = lut[names.codes.values]
+        rec.tofile(self._f)
+    
+    def _to_table(self, df):
+        """청크 → Arrow 테이블 (첫 청크의 스키마에 맞춤)"""
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        if self._schema is None:
+            # 파일명 사전 인덱스를 int32로 고정해 청크마다 범주 수가 달라도 같은 스키마로 기록
+            schema = table.schema
+            i = schema.get_field_index('filename')
+            schema = schema.set(i, pa.field('filename', pa.dictionary(pa.int32(), schema.field(i).type.value_type)))
+            table = table.cast(schema)
+            self._schema = schema
+        return table
+    
+    def _write_csv(self, df):
+        # pandas to_csv 대신 Arrow의 C++ CSV 기록기 사용 (숫자/시각 → 텍스트 변환이 훨씬 빠름)
+        table = self._to_table(df)
+        if self._csv_writer is None:
+            options = pacsv.WriteOptions(include_header=not self._header_written, batch_size=65536)
+            self._csv_writer = pacsv.CSVWriter(self._f, self._schema, write_options=options)
+        self._csv_writer.write_table(table)
+    
+    def _write_parquet(self, df):
+        table = self._to_table(df)
+        if self._pq_writer is None:
+            self._pq_writer = pq.ParquetWriter(self.output_file, self._schema, compression='snappy')
+        self._pq_writer.write_table(table)
+    
+    def close(self):
+        """출력을 마무리하고 저장 경로 반환"""
+        if self.output_format == 'npy':
+            if self._npy_dtype is not None and self.rows != self.expected_rows:
+                # 스킵된 파일이 있으면 헤더의 행 수를 실제 값으로 고침
+                # (numpy가 shape 자리에 여유 공백을 두므로 헤더 길이는 그대로)
+                self._f.seek(0)
+                np.lib.format.write_array_header_1_0(self._f, self._npy_header(self.rows))
+            self._f.close()
+            with open(self.output_base + '_files.txt', 'w', encoding='utf-8') as f:
+                f.write(''.join(f"{name}\n" for name in self._file_ids))
+        elif self.output_format == 'parquet':
+            if self._pq_writer is not None:
+                self._pq_writer.close()
+        else:  # csv
+            if self._csv_writer is not None:
+                self._csv_writer.close()
+            self._f.close()
+        return self.output_file
+
+
 class ConversionWorker(QThread):
     """변환 작업을 백그라운드에서 실행하는 클래스"""
     progress_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str)
     progress_update = pyqtSignal(int, int)  # 현재, 전체
     
-    def __init__(self, sensor_type, dat_dir, sampling_rate, integration_mode):
+    def __init__(self, sensor_type, dat_dir, sampling_rate, integration_mode, output_format='csv'):
         super().__init__()
         self.sensor_type = sensor_type
         self.dat_dir = dat_dir
         self.sampling_rate = sampling_rate
         self.integration_mode = integration_mode  # 'none', 'daily', 'all'
-        
-    def load_dat_file_acc(self, dat_path, sampling_rate):
-        """ACC용 DAT 파일 전체를 읽어 float64 2D np.ndarray (N×3) 반환"""
-        # 파일 크기로 샘플 수 계산
-        file_size = os.path.getsize(dat_path)
-        # 각 세트는 3000개 int16 (6000바이트) + 8바이트 스킵 = 6008바이트
-        sets = file_size // 6008
-        samples = sets * 1000
-        
-        data = np.empty((samples, 3), dtype=np.int16)
-        with open(dat_path, 'rb') as f:
-            for i in range(sets):
-                chunk = np.fromfile(f, dtype=np.int16, count=3000)
-                if len(chunk) < 3000:
-                    # 마지막 청크가 불완전한 경우
-                    actual_samples = len(chunk) // 3
-                    if actual_samples > 0:
-                        chunk = chunk[:actual_samples * 3].reshape(-1, 3)
-                        data[i*1000:i*1000+actual_samples, :] = chunk
-                        samples = i*1000 + actual_samples
-                    else:
-                        samples = i*1000
-                    break
-                chunk = chunk.reshape(-1, 3)
-                data[i*1000:(i+1)*1000, :] = chunk
-                f.seek(8, 1)  # 8바이트 스킵
-        
-        # 실제 읽은 샘플 수만큼 자르기
-        data = data[:samples, :]
-        return data.astype(np.float64) * 0.000488  # 스케일링
-    
-    def load_dat_file_mic(self, dat_path, sampling_rate):
-        """MIC용 DAT 파일 전체를 읽어 int16 1D np.ndarray 반환"""
-        # 파일 크기로 샘플 수 계산
-        file_size = os.path.getsize(dat_path)
-        # 각 세트는 1000개 int16 (2000바이트) + 8바이트 스킵 = 2008바이트
-        sets = file_size // 2008
-        samples = sets * 1000
-        
-        buf = np.empty(samples, dtype=np.int16)
-        with open(dat_path, 'rb') as f:
-            for i in range(sets):
-                chunk = np.fromfile(f, dtype=np.int16, count=1000)
-                if len(chunk) < 1000:
-                    # 마지막 청크가 불완전한 경우
-                    if len(chunk) > 0:
-                        buf[i*1000:i*1000+len(chunk)] = chunk
-                        samples = i*1000 + len(chunk)
-                    else:
-                        samples = i*1000
-                    break
-                buf[i*1000:(i+1)*1000] = chunk
-                f.seek(8, 1)  # 8바이트 스킵
-        
-        # 실제 읽은 샘플 수만큼 자르기
-        return buf[:samples]
+        self.output_format = output_format  # 통합 결과 형식: 'csv', 'npy', 'parquet'
+        # 파일별 로그/진행률은 모아서 전달 (파일마다 시그널 + 메인 스레드 갱신하면 느림)
+        self._log_buf = []
+        self._last_log = time.monotonic()
+        self._last_progress = 0.0
+    
+    def _log(self, line):
+        """로그 한 줄 추가 (64줄 또는 0.25초마다 묶어서 progress_signal 전송)"""
+        self._log_buf.append(line)
+        if len(self._log_buf) >= 64 or time.monotonic() - self._last_log > 0.25:
+            self._flush_log()
+    
+    def _flush_log(self):
+        """모아 둔 로그를 한 번에 전송"""
+        if self._log_buf:
+            self.progress_signal.emit('\n'.join(self._log_buf))
+            self._log_buf.clear()
+        self._last_log = time.monotonic()
+    
+    def _progress(self, current, total):
+        """진행률 전송 (초당 최대 30회, 마지막은 항상 전송)"""
+        now = time.monotonic()
+        if current == total or now - self._last_progress > 0.033:
+            self.progress_update.emit(current, total)
+            self._last_progress = now
     
     def extract_datetime_from_filename(self, filename):
         """파일명에서 날짜/시간 추출 (YYYYMMDD_HH_MM_SS_...)"""
-        try:
-            parts = filename.split('_')
-            if len(parts) >= 4:
-                date_str = parts[0]
-                hour = parts[1]
-                minute = parts[2]
-                second = parts[3]
-                
-                # YYYYMMDD 형식 확인
-                if len(date_str) == 8 and date_str.isdigit():
-                    year = int(date_str[:4])
-                    month = int(date_str[4:6])
-                    day = int(date_str[6:8])
-                    
-                    # 시간 검증
-                    if (hour.isdigit() and minute.isdigit() and second.isdigit() and
-                        0 <= int(hour) <= 23 and 0 <= int(minute) <= 59 and 0 <= int(second) <= 59):
-                        
-                        dt = datetime(year, month, day, int(hour), int(minute), int(second))
-                        return dt
-        except:
-            pass
-        return None
+        return _parse_filename_datetime(filename)
     
     def run(self):
         """변환 작업 실행"""
         try:
             self.progress_signal.emit(f"▶️ {self.sensor_type} 변환 시작 (통합 모드: {self.integration_mode})")
             
-            # 모든 DAT 파일 찾기
-            all_dat_files = []
-            for root, _, files in os.walk(self.dat_dir):
-                dats = [os.path.join(root, f) for f in files if f.lower().endswith('.dat')]
-                all_dat_files.extend(sorted(dats))
+            # 모든 DAT 파일 찾기 (os.scandir 기반 재귀 탐색)
+            all_dat_files = list(_iter_dats(self.dat_dir))
             
             if not all_dat_files:
                 self.finished_signal.emit(False, "❌ DAT 파일을 찾을 수 없습니다.")
@@ -127,13 +352,13 @@ class ConversionWorker(QThread):
             
             if self.integration_mode == 'none':
                 # 기존 방식 - 개별 CSV 생성
-                self._convert_individual_files(all_dat_files)
+                self._convert_individual_files([e.path for e in all_dat_files])
             elif self.integration_mode == 'daily':
                 # 날짜별 통합
-                self._convert_daily_integrated(all_dat_files)
+                self._convert_daily_integrated(self._collect_files(all_dat_files))
             else:  # 'all'
                 # 전체 통합
-                self._convert_all_integrated(all_dat_files)
+                self._convert_all_integrated(self._collect_files(all_dat_files))
                 
         except Exception as e:
             self.finished_signal.emit(False, f"❌ 변환 중 오류 발생: {str(e)}")
@@ -144,55 +369,229 @@ class ConversionWorker(QThread):
         fail_count = 0
         total_files = len(dat_files)
         
-        for idx, dat_path in enumerate(dat_files):
-            self.progress_update.emit(idx + 1, total_files)
-            
+        def report(idx, dat_path, result):
+            nonlocal success_count, fail_count
+            self._progress(idx + 1, total_files)
+            ok, err = result
+            if ok:
+                success_count += 1
+                self._log(f"   ✅ {os.path.relpath(dat_path, self.dat_dir)}")
+            else:
+                fail_count += 1
+                self._log(f"   ❌ 실패: {os.path.relpath(dat_path, self.dat_dir)} ({err})")
+        
+        # 파일별 읽기 + CSV 텍스트 변환(CPU 위주)을 프로세스 풀에서 병렬로 실행 (GIL 영향 없음)
+        # 워커는 Qt 객체를 건드리지 않고 결과만 돌려주며, 기록은 제출 순서대로 메인 쪽에서 함
+        workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            pending = deque()
+            for idx, dat_path in enumerate(dat_files):
+                try:
+                    csv_dir = os.path.join(os.path.dirname(dat_path), 'csv')
+                    os.makedirs(csv_dir, exist_ok=True)
+                    csv_path = os.path.join(csv_dir, os.path.splitext(os.path.basename(dat_path))[0] + '.csv')
+                    future = ex.submit(_convert_one, self.sensor_type, self.sampling_rate, dat_path, csv_path)
+                except Exception as e:
+                    report(idx, dat_path, (False, e))
+                    continue
+                pending.append((idx, dat_path, future))
+                # 풀에 걸려 있는 작업은 워커 수의 2배까지만 유지
+                if len(pending) >= 2 * workers:
+                    idx, dat_path, future = pending.popleft()
+                    report(idx, dat_path, future.result())
+            while pending:
+                idx, dat_path, future = pending.popleft()
+                report(idx, dat_path, future.result())
+        
+        self._flush_log()
+        self.finished_signal.emit(True, f"✅ 개별 변환 완료: 성공 {success_count}개, 실패 {fail_count}개")
+    
+    def _collect_files(self, entries):
+        """DirEntry 목록 → (시각, 경로, 예상 샘플 수) 목록
+        
+        파일명 시각 파싱과 크기 조회를 한 번의 순회로 처리해 통합 단계에서 다시 훑지 않음
+        (읽지 못하는 파일은 샘플 수 0 - 읽을 때 스킵으로 기록됨)
+        """
+        record_bytes = 6008 if self.sensor_type == "ACC" else 2008
+        files = []
+        for e in entries:
             try:
-                file_dir = os.path.dirname(dat_path)
+                n = e.stat().st_size // record_bytes * 1000
+            except OSError:
+                n = 0
+            files.append((self.extract_datetime_from_filename(e.name), e.path, n))
+        return files
+    
+    def _iter_loaded(self, file_list):
+        """file_list 순서대로 (시각, 경로, 데이터, 예외)를 내보냄
+        
+        파일 읽기는 스레드 풀에서 앞서 진행 (read()/NumPy 변환은 GIL을 놓으므로 디스크 대역폭까지 병렬화됨)
+        메모리가 늘지 않도록 동시에 진행 중인 파일 수는 스레드 수의 2배로 제한
+        ACC는 스케일링 전 int16 (세트, 1000, 3)을 내보냄 - 받는 쪽에서 최종 위치에 바로 변환해 기록
+        """
+        if self.sensor_type == "ACC":
+            load = lambda dat_path, sampling_rate: read_dat_file_acc_raw(dat_path)
+        else:  # MIC
+            load = load_dat_file_mic
+        workers = min(32, (os.cpu_count() or 1) + 4)
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for dt, dat_path, _ in file_list:
+                pending.append((dt, dat_path, pool.submit(load, dat_path, self.sampling_rate)))
+                if len(pending) < workers * 2:
+                    continue
+                yield self._take_result(pending.popleft())
+            while pending:
+                yield self._take_result(pending.popleft())
+    
+    @staticmethod
+    def _take_result(item):
+        """(시각, 경로, future) → (시각, 경로, 데이터, 예외)"""
+        dt, dat_path, future = item
+        try:
+            return dt, dat_path, future.result(), None
+        except Exception as e:
+            return dt, dat_path, None, e
+    
+    def _write_integrated(self, df, output_base):
+        """통합 DataFrame 하나를 선택한 형식으로 저장하고 저장 경로 반환"""
+        writer = _IntegratedWriter(self.output_format, output_base, len(df))
+        try:
+            writer.write(df)
+        finally:
+            output_file = writer.close()
+        return output_file
+    
+    def _stream_integrated(self, file_list, output_base, expected_rows):
+        """시간순으로 겹치지 않는 파일들을 읽는 대로 출력에 이어 씀 (메모리는 파일 몇 개 분량만 사용)
+        
+        반환: (저장 경로 또는 None, 기록한 샘플 수)
+        """
+        writer = None
+        try:
+            for dt, dat_path, data, err in self._iter_loaded(file_list):
                 fname = os.path.basename(dat_path)
-                csv_dir = os.path.join(file_dir, 'csv')
-                os.makedirs(csv_dir, exist_ok=True)
-                
+                if err is not None:
+                    self.progress_signal.emit(f"   ⚠️ 파일 스킵: {fname} ({err})")
+                    continue
                 if self.sensor_type == "ACC":
-                    data = self.load_dat_file_acc(dat_path, self.sampling_rate)
-                    n = data.shape[0]
-                    times = np.arange(n) / self.sampling_rate
-                    out = np.column_stack((times, data))
-                    header = 'time_sec,x,y,z'
-                    np.savetxt(os.path.join(csv_dir, os.path.splitext(fname)[0] + '.csv'), 
-                              out, delimiter=',', header=header, comments='', 
-                              fmt=['%.6f', '%.6f', '%.6f', '%.6f'])
+                    values = np.empty((data.shape[0] * 1000, 3), dtype=np.float32)
+                    _scale_acc(data, values, _ACC_SCALE)
+                    data = values
+                n = data.shape[0]
+                if self.sensor_type == "ACC":
+                    df = pd.DataFrame(data, columns=['x', 'y', 'z'])
                 else:  # MIC
-                    data = self.load_dat_file_mic(dat_path, self.sampling_rate)
-                    n = data.shape[0]
-                    times = np.arange(n) / self.sampling_rate
-                    out = np.column_stack((times, data))
-                    header = 'time_sec,mic_value'
-                    np.savetxt(os.path.join(csv_dir, os.path.splitext(fname)[0] + '.csv'), 
-                              out, delimiter=',', header=header, comments='', 
-                              fmt=['%.6f', '%d'])
+                    df = pd.DataFrame(data, columns=['mic_value'])
+                df['timestamp'] = _sample_times_ns(dt, n, self.sampling_rate).view('datetime64[ns]')
+                df['filename'] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int32), categories=[fname])
+                # 처음 읽기에 성공한 파일에서 출력을 엶 (모두 실패하면 파일을 만들지 않음)
+                if writer is None:
+                    writer = _IntegratedWriter(self.output_format, output_base, expected_rows)
+                writer.write(df)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            return None, 0
+        return writer.output_file, writer.rows
+    
+    def _load_integrated(self, file_list, report_progress=False):
+        """(시각, 경로, 예상 샘플 수) 목록의 DAT 파일들을 미리 할당한 배열에 차례로 읽어 DataFrame 하나로 반환
+        
+        샘플 수는 파일 크기로 미리 알 수 있으므로 전체 크기만큼 한 번만 할당하고 각 파일을 제자리에 복사함
+        (파일마다 DataFrame을 만든 뒤 pd.concat으로 전체를 다시 복사하지 않음)
+        반환: (DataFrame 또는 None, 성공 파일 수, 실패 파일 수)
+        """
+        total = sum(n for _, _, n in file_list)
+        if self.sensor_type == "ACC":
+            values = np.empty((total, 3), dtype=np.float32)
+        else:
+            values = np.empty(total, dtype=np.int16)
+        ts_ns = np.empty(total, dtype=np.int64)  # epoch 기준 ns
+        
+        names = []      # 읽기에 성공한 파일명
+        counts = []     # 파일별 샘플 수
+        rel_rows = []   # 날짜를 파싱할 수 없는 파일의 (시작 위치, 샘플 수)
+        off = 0
+        fail_count = 0
+        total_files = len(file_list)
+        
+        for idx, (dt, dat_path, data, err) in enumerate(self._iter_loaded(file_list)):
+            if report_progress:
+                self._progress(idx + 1, total_files)
+            
+            fname = os.path.basename(dat_path)
+            try:
+                if err is not None:
+                    raise err
+                # ACC 원시 데이터는 (세트, 1000, 3) 형태
+                n = data.shape[0] * (1000 if self.sensor_type == "ACC" else 1)
+                if off + n > total:
+                    raise ValueError("읽는 도중 파일 크기가 변경됨")
+                if self.sensor_type == "ACC":
+                    # 미리 할당한 배열의 제자리에 변환하며 기록 (중간 float 배열 없음)
+                    _scale_acc(data, values[off:off + n], _ACC_SCALE)
+                else:
+                    values[off:off + n] = data
                 
-                success_count += 1
-                self.progress_signal.emit(f"   ✅ {os.path.relpath(dat_path, self.dat_dir)}")
+                # 절대 시간 계산
+                if dt:
+                    ts_ns[off:off + n] = _sample_times_ns(dt, n, self.sampling_rate)
+                else:
+                    rel_rows.append((off, n))
+                
+                names.append(fname)
+                counts.append(n)
+                off += n
                 
+                if report_progress and len(names) % 100 == 0:
+                    self.progress_signal.emit(f"   처리 중: {len(names)}/{total_files} 파일...")
+                    
             except Exception as e:
                 fail_count += 1
-                self.progress_signal.emit(f"   ❌ 실패: {os.path.relpath(dat_path, self.dat_dir)} ({e})")
+                self.progress_signal.emit(f"   ⚠️ 파일 스킵: {fname} ({e})")
         
-        self.finished_signal.emit(True, f"✅ 개별 변환 완료: 성공 {success_count}개, 실패 {fail_count}개")
+        if not names:
+            return None, 0, fail_count
+        
+        if self.sensor_type == "ACC":
+            df = pd.DataFrame(values[:off], columns=['x', 'y', 'z'])
+        else:  # MIC
+            df = pd.DataFrame(values[:off], columns=['mic_value'])
+        
+        ts = ts_ns[:off].view('datetime64[ns]')
+        if rel_rows:
+            # 날짜를 파싱할 수 없는 경우 상대 시간만 사용 (절대 시각과 섞이면 object 컬럼)
+            if len(rel_rows) == len(names):
+                timestamp = np.empty(off, dtype=np.float64)
+            else:
+                timestamp = pd.Series(ts).astype(object).to_numpy(copy=True)
+            for start, n in rel_rows:
+                timestamp[start:start + n] = np.arange(n) / self.sampling_rate
+            df['timestamp'] = timestamp
+        else:
+            df['timestamp'] = ts
+        # 파일명은 행마다 문자열을 두지 않고 범주형(코드 배열 + 파일명 목록)으로 저장
+        # 하위 폴더에 같은 이름이 있을 수 있으므로 중복을 제거한 목록을 범주로 사용
+        categories = list(dict.fromkeys(names))
+        code_of = {name: i for i, name in enumerate(categories)}
+        codes = np.repeat(np.array([code_of[name] for name in names], dtype=np.int32), counts)
+        df['filename'] = pd.Categorical.from_codes(codes, categories=categories)
+        return df, len(names), fail_count
     
-    def _convert_daily_integrated(self, dat_files):
-        """날짜별 통합 변환"""
+    def _convert_daily_integrated(self, files):
+        """날짜별 통합 변환 (files: (시각, 경로, 예상 샘플 수) 목록)"""
         # 날짜별로 파일 그룹화
         daily_files = {}
-        for dat_path in dat_files:
-            fname = os.path.basename(dat_path)
-            dt = self.extract_datetime_from_filename(fname)
+        for item in files:
+            dt = item[0]
             if dt:
                 date_key = dt.strftime('%Y-%m-%d')
                 if date_key not in daily_files:
                     daily_files[date_key] = []
-                daily_files[date_key].append((dt, dat_path))
+                daily_files[date_key].append(item)
         
         self.progress_signal.emit(f"📅 {len(daily_files)}개 날짜로 그룹화됨")
         
@@ -215,38 +614,29 @@ class ConversionWorker(QThread):
                 
                 self.progress_signal.emit(f"\n📆 {date_key} 처리 중 ({len(file_list)}개 파일)...")
                 
-                all_data = []
+                output_base = os.path.join(csv_dir, f"{date_key}_{self.sensor_type}_integrated")
+                # 앞 파일의 마지막 샘플 이후에 다음 파일이 시작하면 이어 붙이기만 해도 시간순
+                ends = [pd.Timestamp(dt).value + n * 1_000_000_000 / self.sampling_rate
+                        for dt, _, n in file_list]
+                ordered = all(pd.Timestamp(file_list[i + 1][0]).value >= ends[i]
+                              for i in range(len(file_list) - 1))
                 
-                for dt, dat_path in file_list:
-                    try:
-                        if self.sensor_type == "ACC":
-                            data = self.load_dat_file_acc(dat_path, self.sampling_rate)
-                            df = pd.DataFrame(data, columns=['x', 'y', 'z'])
-                        else:  # MIC
-                            data = self.load_dat_file_mic(dat_path, self.sampling_rate)
-                            df = pd.DataFrame(data, columns=['mic_value'])
-                        
-                        # 절대 시간 계산
-                        time_offset = np.arange(len(df)) / self.sampling_rate
-                        df['timestamp'] = pd.to_datetime(dt) + pd.to_timedelta(time_offset, unit='s')
-                        df['filename'] = os.path.basename(dat_path)
-                        
-                        all_data.append(df)
-                        
-                    except Exception as e:
-                        self.progress_signal.emit(f"   ⚠️ 파일 스킵: {os.path.basename(dat_path)} ({e})")
+                if ordered:
+                    # 하루치를 메모리에 모으지 않고 파일 단위로 바로 기록
+                    output_file, rows = self._stream_integrated(file_list, output_base, sum(n for _, _, n in file_list))
+                else:
+                    # 파일 구간이 겹치면 하루치를 미리 할당한 배열 하나로 읽어 정렬한 뒤 저장
+                    # (파일은 이미 시작 시각 순이므로 거의 정렬된 입력 → 안정 정렬(mergesort)이 유리)
+                    combined_df, _, _ = self._load_integrated(file_list)
+                    output_file, rows = None, 0
+                    if combined_df is not None:
+                        combined_df.sort_values('timestamp', kind='mergesort', ignore_index=True, inplace=True)
+                        output_file = self._write_integrated(combined_df, output_base)
+                        rows = len(combined_df)
                 
-                if all_data:
-                    # 데이터 결합
-                    combined_df = pd.concat(all_data, ignore_index=True)
-                    combined_df = combined_df.sort_values('timestamp').reset_index(drop=True)
-                    
-                    # CSV 저장
-                    output_file = os.path.join(csv_dir, f"{date_key}_{self.sensor_type}_integrated.csv")
-                    combined_df.to_csv(output_file, index=False)
-                    
+                if output_file is not None:
                     success_days += 1
-                    self.progress_signal.emit(f"   ✅ {date_key} 통합 완료: {len(combined_df):,}개 샘플")
+                    self.progress_signal.emit(f"   ✅ {date_key} 통합 완료: {rows:,}개 샘플")
                     self.progress_signal.emit(f"      → {output_file}")
                 else:
                     fail_days += 1
@@ -260,67 +650,30 @@ class ConversionWorker(QThread):
             f"✅ 날짜별 통합 완료: 성공 {success_days}일, 실패 {fail_days}일\n" +
             f"   저장 위치: {csv_dir}")
     
-    def _convert_all_integrated(self, dat_files):
-        """전체 통합 변환"""
+    def _convert_all_integrated(self, file_list):
+        """전체 통합 변환 (file_list: (시각, 경로, 예상 샘플 수) 목록)"""
         self.progress_signal.emit("🔄 전체 파일을 하나로 통합 중...")
         
-        all_data = []
-        success_count = 0
-        fail_count = 0
-        total_files = len(dat_files)
+        # 모든 파일을 미리 할당한 배열 하나로 읽음 (pd.concat 없음)
+        combined_df, success_count, fail_count = self._load_integrated(file_list, report_progress=True)
         
-        for idx, dat_path in enumerate(dat_files):
-            self.progress_update.emit(idx + 1, total_files)
-            
-            fname = os.path.basename(dat_path)
-            dt = self.extract_datetime_from_filename(fname)
-            
-            try:
-                if self.sensor_type == "ACC":
-                    data = self.load_dat_file_acc(dat_path, self.sampling_rate)
-                    df = pd.DataFrame(data, columns=['x', 'y', 'z'])
-                else:  # MIC
-                    data = self.load_dat_file_mic(dat_path, self.sampling_rate)
-                    df = pd.DataFrame(data, columns=['mic_value'])
-                
-                # 시간 정보 추가
-                if dt:
-                    time_offset = np.arange(len(df)) / self.sampling_rate
-                    df['timestamp'] = pd.to_datetime(dt) + pd.to_timedelta(time_offset, unit='s')
-                else:
-                    # 날짜를 파싱할 수 없는 경우 상대 시간만 사용
-                    df['timestamp'] = np.arange(len(df)) / self.sampling_rate
-                
-                df['filename'] = fname
-                all_data.append(df)
-                success_count += 1
-                
-                if success_count % 100 == 0:
-                    self.progress_signal.emit(f"   처리 중: {success_count}/{total_files} 파일...")
-                    
-            except Exception as e:
-                fail_count += 1
-                self.progress_signal.emit(f"   ⚠️ 파일 스킵: {fname} ({e})")
-        
-        if all_data:
+        if combined_df is not None:
             self.progress_signal.emit("📊 데이터 결합 중...")
             
-            # 모든 데이터 결합
-            combined_df = pd.concat(all_data, ignore_index=True)
-            
-            # timestamp가 datetime인 경우만 정렬
-            if pd.api.types.is_datetime64_any_dtype(combined_df['timestamp']):
-                combined_df = combined_df.sort_values('timestamp').reset_index(drop=True)
+            # timestamp가 datetime인 경우만 정렬 (이미 시간순이면 건너뜀, 아니면 안정 정렬 + 인덱스 재설정을 한 번에)
+            ts = combined_df['timestamp']
+            if pd.api.types.is_datetime64_any_dtype(ts) and not ts.is_monotonic_increasing:
+                combined_df.sort_values('timestamp', kind='mergesort', ignore_index=True, inplace=True)
             
             # CSV 저장
             csv_dir = os.path.join(self.dat_dir, 'integrated_csv')
             os.makedirs(csv_dir, exist_ok=True)
             
             timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_file = os.path.join(csv_dir, f"ALL_{self.sensor_type}_integrated_{timestamp_str}.csv")
+            output_base = os.path.join(csv_dir, f"ALL_{self.sensor_type}_integrated_{timestamp_str}")
             
-            self.progress_signal.emit("💾 CSV 파일 저장 중...")
-            combined_df.to_csv(output_file, index=False)
+            self.progress_signal.emit(f"💾 {self.output_format.upper()} 파일 저장 중...")
+            output_file = self._write_integrated(combined_df, output_base)
             
             self.finished_signal.emit(True, 
                 f"✅ 전체 통합 완료:\n" +
@@ -372,6 +725,16 @@ class MainWindow(QMainWindow):
         self.integration_combo.setCurrentIndex(1)  # 기본값: 날짜별 통합
         
         integration_layout.addWidget(self.integration_combo)
+        
+        # 통합 결과 출력 형식 (대용량이면 NPY/Parquet이 CSV보다 훨씬 빠름)
+        self.format_combo = QComboBox()
+        self.format_combo.addItem("CSV", "csv")
+        self.format_combo.addItem("NPY (NumPy 바이너리)", "npy")
+        self.format_combo.addItem("Parquet", "parquet")
+        format_layout = QHBoxLayout()
+        format_layout.addWidget(QLabel("통합 출력 형식:"))
+        format_layout.addWidget(self.format_combo)
+        integration_layout.addLayout(format_layout)
         integration_group.setLayout(integration_layout)
         main_layout.addWidget(integration_group)
         
@@ -472,6 +835,7 @@ class MainWindow(QMainWindow):
         sensor_type = "ACC" if self.acc_radio.isChecked() else "MIC"
         sampling_rate = self.rate_input.value()
         integration_mode = self.integration_combo.currentData()
+        output_format = self.format_combo.currentData()
         
         # UI 업데이트
         self.convert_button.setEnabled(False)
@@ -481,7 +845,7 @@ class MainWindow(QMainWindow):
         
         # 작업 스레드 시작
         self.worker = ConversionWorker(
-            sensor_type, dat_dir, sampling_rate, integration_mode
+            sensor_type, dat_dir, sampling_rate, integration_mode, output_format
         )
         self.worker.progress_signal.connect(self.log_message)
         self.worker.progress_update.connect(self.update_progress)
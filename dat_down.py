@@ -2,15 +2,83 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkinter import font
 import boto3
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ClientError
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 import threading
 import subprocess
+import shutil
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+import heapq
+import itertools
 import queue
+import time
+import hashlib
+import urllib3
+
+# 로그 창에 유지할 최대 줄 수 - Text 위젯이 커질수록 삽입/스크롤 비용이 늘어나므로 오래된 줄부터 삭제
+MAX_LOG_LINES = 5000
+
+# 아직 화면에 반영하지 않은 로그를 담아둘 최대 줄 수 (넘치면 가장 오래된 줄부터 버림)와 한 번에 반영할 줄 수
+LOG_RING_SIZE = 10000
+LOG_FLUSH_BATCH = 200
+
+# 동시 다운로드 스레드 최대 수 - 스레드는 소켓 대기 중 GIL을 놓으므로 작은 파일이 많을 때 연결 수를 늘릴수록 유리
+MAX_DOWNLOAD_WORKERS = 128
+
+# 이 크기 이상인 파일은 바이트 범위로 나눠 동시에 받음 (단일 연결 대역폭 한계 회피)
+RANGED_GET_THRESHOLD = 32 << 20
+RANGED_GET_PART_SIZE = 16 << 20
+RANGED_GET_THREADS = 8
+
+# 이 크기 이하인 파일은 메모리로 받은 뒤 디스크 기록을 별도 기록 스레드에 넘겨 다운로드 스레드가 바로 다음 요청을 보내게 함
+# 대기 중인 기록은 동시 다운로드 수의 2배로 제한해 메모리 사용량을 묶어 둠
+WRITE_OFFLOAD_MAX_SIZE = 4 << 20
+WRITER_THREADS = 4
+
+# 동시 다운로드 수 자동 조절 - 측정 구간(초)마다 처리량이 5% 넘게 늘면 1.5배로 늘리고, S3 SlowDown(503)이면 절반으로 줄임
+AUTO_TUNE_WINDOW = 2.0
+AUTO_TUNE_MIN_GAIN = 1.05
+AUTO_TUNE_SCALE_UP = 1.5
+# SlowDown(503)으로 실패한 파일은 1, 2, 4...초 기다렸다가 다시 받고, 이 횟수를 넘으면 실패로 집계
+SLOWDOWN_MAX_RETRIES = 5
+SLOWDOWN_BACKOFF = 1.0
+
+# 버킷 목록 캐시 유지 시간(초) - '버킷 목록 불러오기'를 반복해서 눌러도 다시 요청하지 않음
+BUCKET_CACHE_TTL = 60
+
+# 다운로드용 presigned URL 유효 시간(초) - 작업을 제출하기 직전에 서명하므로 파일 하나를 받는 동안만 유효하면 됨
+PRESIGNED_URL_EXPIRES = 3600
+
+# presigned URL GET 연결/응답 대기 제한(초) - botocore 기본값과 같게 해 멈춘 연결이 다운로드 스레드를 붙잡지 않게 함
+HTTP_CONNECT_TIMEOUT = 60
+HTTP_READ_TIMEOUT = 60
+
+def open_preallocated(path, size):
+    """path를 쓰기용으로 열고 size 바이트를 미리 할당한 파일 객체 반환 (버퍼 없음)
+    
+    여러 스레드가 같은 폴더에 동시에 기록할 때 파일이 늘어날 때마다 생기는 extent 할당/메타데이터 갱신을 줄임.
+    posix_fallocate가 없는 OS(Windows 등)는 크기만 잡아둠
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        if size > 0:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, size)
+            else:
+                os.ftruncate(fd, size)
+    except OSError:
+        pass  # 선할당을 지원하지 않는 파일시스템은 그대로 기록
+    return os.fdopen(fd, 'wb', buffering=0)
+
+
+class SlowDownError(Exception):
+    """S3가 503 SlowDown으로 요청 속도 제한을 알린 경우"""
+
 
 class S3DataDownloader:
     def __init__(self, root):
@@ -33,14 +101,41 @@ class S3DataDownloader:
         
         # S3 클라이언트
         self.s3_client = None
+        # presigned URL 서명용 버킷 리전별 클라이언트 (버킷 이름 -> 클라이언트)
+        self._presign_clients = {}
+        
+        # list_buckets 응답 캐시 (버킷 이름 목록, 조회 시각)
+        self._buckets_cache = None
+        self._buckets_cache_ts = 0
+        
+        # 디스크 기록 스레드 풀과 대기 중 기록 수 제한 (download_files_parallel에서 날짜마다 생성)
+        self._writer = None
+        self._write_slots = None
+        
+        # presigned URL 다운로드용 HTTP 연결 풀 (모든 다운로드 스레드가 공유, 연결 수를 넘는 요청은 풀에서 대기)
+        self._http_pool = urllib3.PoolManager(
+            maxsize=MAX_DOWNLOAD_WORKERS,
+            block=True,
+            timeout=urllib3.Timeout(connect=HTTP_CONNECT_TIMEOUT, read=HTTP_READ_TIMEOUT),
+            retries=urllib3.Retry(total=5, backoff_factor=0.5, status_forcelist=(500, 502, 504))
+        )
+        # 자동 조절을 끈 경우 503 SlowDown도 urllib3가 재시도 (켠 경우는 SlowDownError로 받아 동시 실행 수를 줄임)
+        self._retry_with_503 = urllib3.Retry(total=5, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+        # GET 요청별 재시도 설정 (None이면 연결 풀 기본값, download_files_parallel에서 날짜마다 설정)
+        self._get_retries = None
         
         # 다운로드 설정
         self.max_workers = 10  # 동시 다운로드 스레드 수
-        self.download_queue = queue.Queue()
+        self.download_queue = queue.Queue()  # 다운로드 스레드 -> UI 스레드 상태/진행률 메시지
+        # 로그는 잠금 없는 deque 링 버퍼로 전달 (append/popleft는 스레드 안전)
+        self._log_ring = deque(maxlen=LOG_RING_SIZE)
         
         # UI 생성
         self.create_ui()
         
+        # 다운로드 스레드가 넣은 메시지를 200ms마다 한 번에 반영
+        self.root.after(200, self._drain_progress)
+        
     def create_ui(self):
         """UI 생성"""
         # 메인 프레임
@@ -194,7 +289,7 @@ class S3DataDownloader:
         
         # 중복 파일 건너뛰기 옵션
         self.skip_existing_var = tk.BooleanVar(value=True)
-        skip_cb = ttk.Checkbutton(time_frame, text="이미 존재하는 파일 건너뛰기",
+        skip_cb = ttk.Checkbutton(time_frame, text="이미 받은 파일 건너뛰기 (크기/ETag 비교)",
                                   variable=self.skip_existing_var)
         skip_cb.grid(row=3, column=0, columnspan=3, pady=5, sticky=tk.W)
         
@@ -219,11 +314,15 @@ class S3DataDownloader:
         
         ttk.Label(settings_frame, text="동시 다운로드 수:").grid(row=0, column=0, sticky=tk.W, pady=5)
         self.workers_var = tk.IntVar(value=10)
-        workers_spinbox = ttk.Spinbox(settings_frame, from_=1, to=50, textvariable=self.workers_var, width=10)
+        workers_spinbox = ttk.Spinbox(settings_frame, from_=1, to=MAX_DOWNLOAD_WORKERS, textvariable=self.workers_var, width=10)
         workers_spinbox.grid(row=0, column=1, padx=5, sticky=tk.W)
-        ttk.Label(settings_frame, text="(1-50, 높을수록 빠르지만 네트워크 부하 증가)", 
+        ttk.Label(settings_frame, text=f"(1-{MAX_DOWNLOAD_WORKERS}, 높을수록 빠르지만 네트워크 부하 증가)", 
                  font=('Arial', 9, 'italic')).grid(row=0, column=2, padx=10, sticky=tk.W)
         
+        self.auto_workers_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(settings_frame, text="처리량에 따라 동시 다운로드 수 자동 조절 (입력값에서 시작)",
+                        variable=self.auto_workers_var).grid(row=1, column=0, columnspan=3, pady=5, sticky=tk.W)
+        
         # 진행 상황
         progress_frame = ttk.Frame(main_frame)
         progress_frame.grid(row=8, column=0, columnspan=3, pady=5, sticky=(tk.W, tk.E))
@@ -315,6 +414,11 @@ class S3DataDownloader:
                 self.aws_region = os.getenv('AWS_REGION', 'us-east-1')
                 self.bucket_name = os.getenv('S3_BUCKET_NAME')
                 
+                # 자격 증명이 바뀌었을 수 있으므로 클라이언트와 버킷 목록 캐시 초기화
+                self.s3_client = None
+                self._presign_clients = {}
+                self._buckets_cache = None
+                
                 # 디버깅 정보 출력
                 self.log("로드된 환경 변수:")
                 self.log(f"  AWS_ACCESS_KEY_ID: {'있음' if self.aws_access_key else '없음'}")
@@ -349,21 +453,15 @@ class S3DataDownloader:
         def test_async():
             try:
                 # S3 클라이언트 생성
-                self.s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=self.aws_access_key,
-                    aws_secret_access_key=self.aws_secret_key,
-                    region_name=self.aws_region
-                )
+                self.s3_client = self.create_s3_client()
                 
-                # 버킷 목록 가져오기 (연결 테스트)
-                response = self.s3_client.list_buckets()
-                bucket_count = len(response['Buckets'])
+                # 버킷 목록 가져오기 (연결 테스트이므로 캐시를 쓰지 않고 새로 조회해 캐시 갱신)
+                bucket_names = self.get_bucket_names(refresh=True)
+                bucket_count = len(bucket_names)
                 
                 self.root.after(0, lambda: self.log(f"✅ S3 연결 성공! {bucket_count}개의 버킷 발견"))
                 
                 # 버킷 목록 업데이트
-                bucket_names = [bucket['Name'] for bucket in response['Buckets']]
                 self.root.after(0, lambda: self.bucket_combo.configure(values=bucket_names))
                 
                 self.root.after(0, lambda: messagebox.showinfo("연결 성공", 
@@ -380,23 +478,72 @@ class S3DataDownloader:
         thread = threading.Thread(target=test_async)
         thread.start()
     
+    def create_s3_client(self, region=None):
+        """S3 클라이언트 생성 (다운로드 스레드들이 함께 사용, region을 주지 않으면 AWS_REGION)
+        
+        botocore 기본 연결 풀(10개)보다 스레드가 많으면 풀에서 대기하므로
+        최대 동시 다운로드 수만큼 연결 풀을 잡고, 일시적인 오류는 adaptive 모드로 재시도.
+        paginator 모델과 presign 서명기는 첫 호출 때 만들어지므로 생성 시점에 미리 한 번 호출해 둠
+        """
+        config = Config(
+            max_pool_connections=MAX_DOWNLOAD_WORKERS,
+            retries={'mode': 'adaptive', 'max_attempts': 10},
+            tcp_keepalive=True
+        )
+        client = boto3.client(
+            's3',
+            aws_access_key_id=self.aws_access_key,
+            aws_secret_access_key=self.aws_secret_key,
+            region_name=region or self.aws_region,
+            config=config
+        )
+        # 네트워크 요청 없이 로컬에서만 처리됨
+        client.get_paginator('list_objects_v2')
+        client.generate_presigned_url('get_object', Params={'Bucket': 'warmup', 'Key': 'warmup'})
+        return client
+    
+    def get_presign_client(self, bucket):
+        """bucket이 있는 리전의 클라이언트 반환 (presigned URL 서명용, 버킷마다 한 번만 조회)
+        
+        presigned URL로 직접 GET 하면 botocore의 리전 리다이렉트 처리를 거치지 않으므로
+        AWS_REGION과 버킷 리전이 다르면 버킷 리전으로 서명해야 함. 리전 조회 권한이 없으면 기본 클라이언트 사용
+        """
+        if bucket not in self._presign_clients:
+            client = self.s3_client
+            try:
+                # us-east-1 버킷은 LocationConstraint가 비어 있고, 오래된 eu-west-1 버킷은 'EU'로 옴
+                region = self.s3_client.get_bucket_location(Bucket=bucket).get('LocationConstraint') or 'us-east-1'
+                region = {'EU': 'eu-west-1'}.get(region, region)
+                if region != self.aws_region:
+                    self.log(f"  버킷 리전: {region} (AWS_REGION {self.aws_region}와 달라 버킷 리전으로 서명)")
+                    client = self.create_s3_client(region)
+            except ClientError as e:
+                self.log(f"  버킷 리전 조회 실패, AWS_REGION으로 서명: {e}")
+            self._presign_clients[bucket] = client
+        return self._presign_clients[bucket]
+    
+    def get_bucket_names(self, refresh=False):
+        """버킷 이름 목록 반환 (BUCKET_CACHE_TTL 안에 조회한 결과가 있으면 재사용)"""
+        if (not refresh and self._buckets_cache is not None
+                and time.monotonic() - self._buckets_cache_ts < BUCKET_CACHE_TTL):
+            return self._buckets_cache
+        
+        response = self.s3_client.list_buckets()
+        self._buckets_cache = [bucket['Name'] for bucket in response['Buckets']]
+        self._buckets_cache_ts = time.monotonic()
+        return self._buckets_cache
+    
     def load_buckets(self):
         """S3 버킷 목록 불러오기"""
         if not self.s3_client:
             try:
-                self.s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=self.aws_access_key,
-                    aws_secret_access_key=self.aws_secret_key,
-                    region_name=self.aws_region
-                )
+                self.s3_client = self.create_s3_client()
             except Exception as e:
                 messagebox.showerror("오류", f"S3 클라이언트 생성 실패: {str(e)}")
                 return
         
         try:
-            response = self.s3_client.list_buckets()
-            bucket_names = [bucket['Name'] for bucket in response['Buckets']]
+            bucket_names = self.get_bucket_names()
             self.bucket_combo['values'] = bucket_names
             self.log(f"{len(bucket_names)}개의 버킷을 불러왔습니다.")
         except Exception as e:
@@ -467,15 +614,77 @@ class S3DataDownloader:
     
     def download_single_file(self, file_info):
         """단일 파일 다운로드 (멀티스레딩용)"""
-        bucket = file_info['bucket']
         key = file_info['key']
+        url = file_info['url']
         local_path = file_info['local_path']
         
+        # 작은 파일이 대부분이므로 boto3 요청 처리(파라미터 검증, 서명, 이벤트 훅) 없이 미리 서명한 URL을
+        # 공유 연결 풀로 바로 GET 하고 1MB 단위로 기록. 중간에 실패한 파일이 '이미 존재'로 스킵되지 않도록 임시 파일에 받은 뒤 이름 변경
+        tmp_path = local_path + '.part'
         try:
-            self.s3_client.download_file(bucket, key, local_path)
+            if file_info['size'] >= RANGED_GET_THRESHOLD:
+                self._ranged_get(url, file_info['size'], tmp_path)
+            else:
+                offload = file_info['size'] <= WRITE_OFFLOAD_MAX_SIZE
+                with self._http_pool.request('GET', url, preload_content=offload,
+                                             retries=self._get_retries) as response:
+                    if response.status == 503:
+                        raise SlowDownError("HTTP 503 SlowDown")
+                    if response.status != 200:
+                        raise Exception(f"HTTP {response.status}")
+                    if offload:
+                        # 기록 대기열이 차 있으면 여기서 기다림 (기록이 끝나면 _write_file이 반환)
+                        self._write_slots.acquire()
+                        write_future = self._writer.submit(self._write_file, response.data, tmp_path, local_path)
+                        return {'success': True, 'key': key, 'write_future': write_future}
+                    with open_preallocated(tmp_path, file_info['size']) as f:
+                        shutil.copyfileobj(response, f, length=1 << 20)
+            os.replace(tmp_path, local_path)
             return {'success': True, 'key': key}
         except Exception as e:
-            return {'success': False, 'key': key, 'error': str(e)}
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return {'success': False, 'key': key, 'error': str(e),
+                    'throttled': isinstance(e, SlowDownError)}
+    
+    def _write_file(self, data, tmp_path, local_path):
+        """기록 스레드에서 받은 데이터를 임시 파일에 쓰고 이름 변경 (실패 시 예외는 Future로 전달)"""
+        try:
+            with open_preallocated(tmp_path, len(data)) as f:
+                f.write(data)
+            os.replace(tmp_path, local_path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            self._write_slots.release()
+    
+    def _ranged_get(self, url, size, local_path, part=RANGED_GET_PART_SIZE, threads=RANGED_GET_THREADS):
+        """큰 파일을 part 바이트 단위 Range GET으로 나눠 동시에 받아 미리 크기를 잡아둔 파일의 해당 위치에 기록"""
+        open_preallocated(local_path, size).close()
+        
+        def fetch_part(offset):
+            end = min(offset + part, size) - 1
+            with self._http_pool.request('GET', url, headers={'Range': f'bytes={offset}-{end}'},
+                                         preload_content=False, retries=self._get_retries) as response:
+                if response.status == 503:
+                    raise SlowDownError(f"HTTP 503 SlowDown (bytes={offset}-{end})")
+                if response.status != 206:
+                    raise Exception(f"HTTP {response.status} (bytes={offset}-{end})")
+                # 구간마다 파일을 따로 열어 seek 후 기록 (os.pwrite는 Windows에서 사용할 수 없음)
+                with open(local_path, 'r+b', buffering=0) as f:
+                    f.seek(offset)
+                    shutil.copyfileobj(response, f, length=1 << 20)
+        
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # result()로 구간 다운로드 중 발생한 예외를 호출자에게 전달
+            for future in [executor.submit(fetch_part, o) for o in range(0, size, part)]:
+                future.result()
     
     def is_file_in_time_range(self, filename, start_hour, start_minute, end_hour, end_minute):
         """파일명에서 시간을 추출하여 지정된 시간 범위 내에 있는지 확인"""
@@ -502,74 +711,206 @@ class S3DataDownloader:
             pass
         return True  # 파싱 실패 시 포함
     
+    def is_already_downloaded(self, local_path, file_obj):
+        """로컬 파일이 S3 객체와 같은지 확인 (크기 비교 후, 단일 업로드 객체는 ETag(MD5)까지 비교)"""
+        try:
+            if os.stat(local_path).st_size != file_obj['Size']:
+                return False
+        except OSError:
+            return False
+        
+        # 멀티파트 업로드 객체의 ETag는 'MD5-파트수' 형식이라 내용 MD5와 비교할 수 없으므로 크기만 비교
+        etag = file_obj.get('ETag', '').strip('"')
+        if len(etag) != 32 or '-' in etag:
+            return True
+        
+        md5 = hashlib.md5()
+        with open(local_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                md5.update(chunk)
+        return md5.hexdigest() == etag
+    
     def download_files_parallel(self, dat_files, date_folder, current_date):
         """병렬로 파일 다운로드"""
-        # 다운로드 작업 준비
-        download_tasks = []
+        # Tk 변수 읽기는 매번 Tcl 호출이므로 파일 루프 밖에서 한 번만 읽음
+        bucket = self.bucket_var.get()
+        skip_existing = self.skip_existing_var.get()
+        auto_tune = self.auto_workers_var.get()
+        presign_client = self.get_presign_client(bucket)
+        time_range = None
+        if self.use_time_range_var.get():
+            time_range = (int(self.start_hour.get()), int(self.start_minute.get()),
+                          int(self.end_hour.get()), int(self.end_minute.get()))
+        
+        # 다운로드 작업 준비 (제출할 때 앞에서부터 꺼내 쓰므로 deque)
+        download_tasks = deque()
+        skipped_count = 0
+        # 파일마다 os.path.join/basename을 부르지 않도록 폴더 경로는 한 번만 만들고, S3 키는 항상 '/' 구분이므로 rpartition 사용
+        date_folder_prefix = os.path.join(date_folder, '')
         for file_obj in dat_files:
             file_key = file_obj['Key']
-            file_name = os.path.basename(file_key)
-            local_path = os.path.join(date_folder, file_name)
+            file_name = file_key.rpartition('/')[2]
+            local_path = date_folder_prefix + file_name
             
             # 시간 범위 체크
             should_download = True
-            if self.use_time_range_var.get():
-                start_hour = int(self.start_hour.get())
-                start_minute = int(self.start_minute.get())
-                end_hour = int(self.end_hour.get())
-                end_minute = int(self.end_minute.get())
-                
-                if not self.is_file_in_time_range(file_name, start_hour, start_minute, end_hour, end_minute):
-                    should_download = False
+            if time_range and not self.is_file_in_time_range(file_name, *time_range):
+                should_download = False
             
             # 중복 파일 체크
-            if should_download and self.skip_existing_var.get() and os.path.exists(local_path):
-                self.log(f"  ⏭️ 스킵 (이미 존재): {file_name}")
+            if should_download and skip_existing and self.is_already_downloaded(local_path, file_obj):
+                skipped_count += 1
                 should_download = False
             
             if should_download:
                 download_tasks.append({
-                    'bucket': self.bucket_var.get(),
                     'key': file_key,
+                    'size': file_obj['Size'],
                     'local_path': local_path
                 })
         
+        if skipped_count:
+            self.log(f"  ⏭️ 이미 받은 파일 {skipped_count}개 건너뜀")
+        
         if not download_tasks:
-            return 0, 0, 0, 0
+            return 0, 0, skipped_count, 0, 0
         
         # 멀티스레딩으로 다운로드
         downloaded_count = 0
         failed_count = 0
-        start_time = datetime.now()
-        
-        with ThreadPoolExecutor(max_workers=self.workers_var.get()) as executor:
-            # 모든 다운로드 작업 제출
-            future_to_task = {executor.submit(self.download_single_file, task): task 
-                             for task in download_tasks}
-            
-            # 완료된 작업 처리
-            for i, future in enumerate(as_completed(future_to_task)):
-                result = future.result()
+        completed = 0
+        total_tasks = len(download_tasks)
+        day_label = f"{current_date:%Y-%m-%d}"
+        start_time = time.monotonic()
+        
+        # 동시 실행 수 - 자동 조절 시 스레드 풀은 최대치로 만들고 제출 개수로 실제 동시성을 제한
+        cur_workers = self.max_workers
+        pending_tasks = download_tasks
+        running = {}
+        # SlowDown 재시도 대기 작업 (재시도 시각, 순번, 작업) 힙
+        delayed_tasks = []
+        retry_seq = itertools.count()
+        # 동시 실행 수를 줄인 횟수 - 줄이기 전에 제출된 요청의 503은 이미 반영된 것이므로 다시 줄이지 않음
+        cut_gen = 0
+        window_start = time.monotonic()
+        window_bytes = 0
+        prev_rate = None
+        
+        # 기록 스레드에서 실패한 파일 (key, 오류) - 콜백은 기록 스레드에서 호출됨
+        write_errors = []
+        
+        def on_write_done(write_future, key):
+            if write_future.exception() is not None:
+                write_errors.append((key, str(write_future.exception())))
+        
+        pool_size = MAX_DOWNLOAD_WORKERS if auto_tune else cur_workers
+        self._write_slots = threading.BoundedSemaphore(pool_size * 2)
+        self._get_retries = None if auto_tune else self._retry_with_503
+        
+        # 다운로드 풀이 먼저 닫힌 뒤 기록 풀이 남은 기록을 모두 끝낼 때까지 대기
+        with ThreadPoolExecutor(max_workers=WRITER_THREADS) as self._writer, \
+                ThreadPoolExecutor(max_workers=pool_size) as executor:
+            while pending_tasks or running or delayed_tasks:
+                # 대기 시간이 지난 재시도 작업을 다시 대기열에 넣음
+                now = time.monotonic()
+                while delayed_tasks and delayed_tasks[0][0] <= now:
+                    pending_tasks.append(heapq.heappop(delayed_tasks)[2])
                 
-                if result['success']:
-                    downloaded_count += 1
-                else:
-                    failed_count += 1
-                    self.log(f"  다운로드 실패: {os.path.basename(result['key'])} - {result.get('error', 'Unknown error')}")
+                # 동시 실행 수만큼 작업 제출 - Future와 URL은 실행 중인 작업만 갖도록 제출 직전에 서명 (로컬 계산만 함)
+                while pending_tasks and len(running) < cur_workers:
+                    task = pending_tasks.popleft()
+                    if 'url' not in task:
+                        task['url'] = presign_client.generate_presigned_url(
+                            'get_object',
+                            Params={'Bucket': bucket, 'Key': task['key']},
+                            ExpiresIn=PRESIGNED_URL_EXPIRES
+                        )
+                    task['gen'] = cut_gen
+                    running[executor.submit(self.download_single_file, task)] = task
+                saturated = len(running) >= cur_workers
                 
-                # 진행률 업데이트
-                if (i + 1) % 50 == 0 or (i + 1) == len(download_tasks):
-                    progress = (i + 1) / len(download_tasks) * 100
-                    elapsed_time = (datetime.now() - start_time).total_seconds()
-                    speed = (i + 1) / elapsed_time if elapsed_time > 0 else 0
+                # 완료된 작업 처리 (측정 구간이 끝나거나 재시도 시각이 되면 완료가 없어도 깨어남)
+                timeout = AUTO_TUNE_WINDOW
+                if delayed_tasks:
+                    timeout = min(timeout, max(0.0, delayed_tasks[0][0] - now))
+                if running:
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    # 재시도 대기 중인 작업만 남은 경우
+                    time.sleep(timeout)
+                    done = ()
+                throttled = False
+                for future in done:
+                    task = running.pop(future)
+                    result = future.result()
                     
-                    self.root.after(0, lambda p=progress, s=speed, d=current_date, i=i+1, t=len(download_tasks): 
-                        self.status_label.config(text=f"{d.strftime('%Y-%m-%d')} 다운로드 중... ({i}/{t}) - {s:.1f} 파일/초"))
-        
-        elapsed_time = (datetime.now() - start_time).total_seconds()
+                    if result['success']:
+                        downloaded_count += 1
+                        window_bytes += task['size']
+                        if 'write_future' in result:
+                            result['write_future'].add_done_callback(
+                                lambda f, k=result['key']: on_write_done(f, k))
+                    elif auto_tune and result.get('throttled'):
+                        # 속도 제한으로 실패한 파일은 동시 실행 수를 줄이고, 시도 횟수만큼 늘어나는 시간을 기다린 뒤 다시 받음
+                        # (같은 503 묶음이 여러 번에 나눠 돌아와도 마지막으로 줄인 뒤 제출된 요청만 다시 줄이는 데 반영)
+                        throttled = throttled or task['gen'] == cut_gen
+                        task['attempts'] = task.get('attempts', 0) + 1
+                        if task['attempts'] <= SLOWDOWN_MAX_RETRIES:
+                            retry_at = time.monotonic() + SLOWDOWN_BACKOFF * 2 ** (task['attempts'] - 1)
+                            heapq.heappush(delayed_tasks, (retry_at, next(retry_seq), task))
+                            continue
+                        failed_count += 1
+                        self.log(f"  다운로드 실패: {result['key'].rpartition('/')[2]} - "
+                                 f"SlowDown 재시도 {SLOWDOWN_MAX_RETRIES}회 초과")
+                    else:
+                        failed_count += 1
+                        self.log(f"  다운로드 실패: {result['key'].rpartition('/')[2]} - {result.get('error', 'Unknown error')}")
+                    completed += 1
+                    
+                    # 진행률 업데이트
+                    if completed % 50 == 0 or completed == total_tasks:
+                        elapsed_time = time.monotonic() - start_time
+                        speed = completed / elapsed_time if elapsed_time > 0 else 0
+                        
+                        self.download_queue.put(('status',
+                            f"{day_label} 다운로드 중... ({completed}/{total_tasks}) - {speed:.1f} 파일/초"))
+                
+                if not auto_tune:
+                    continue
+                
+                # 동시 다운로드 수 조절
+                now = time.monotonic()
+                if throttled:
+                    new_workers = max(1, cur_workers // 2)
+                    if new_workers != cur_workers:
+                        self.log(f"  S3 SlowDown 감지 - 동시 다운로드 수 {cur_workers} → {new_workers}")
+                        cur_workers = new_workers
+                    cut_gen += 1
+                    window_start, window_bytes, prev_rate = now, 0, None
+                elif now - window_start >= AUTO_TUNE_WINDOW:
+                    rate = window_bytes / (now - window_start)
+                    # 모든 슬롯이 차 있었을 때만 늘림 (남은 작업이 적어 덜 찬 경우는 측정값이 의미 없음)
+                    if (prev_rate is None or rate > prev_rate * AUTO_TUNE_MIN_GAIN) \
+                            and saturated and cur_workers < MAX_DOWNLOAD_WORKERS:
+                        new_workers = min(MAX_DOWNLOAD_WORKERS, max(cur_workers + 1, int(cur_workers * AUTO_TUNE_SCALE_UP)))
+                        self.log(f"  처리량 {self.format_file_size(rate)}/s - 동시 다운로드 수 {cur_workers} → {new_workers}")
+                        cur_workers = new_workers
+                    prev_rate = rate
+                    window_start, window_bytes = now, 0
+        
+        # 디스크 기록 실패는 다운로드 성공에서 빼고 실패로 집계
+        for key, error in write_errors:
+            downloaded_count -= 1
+            failed_count += 1
+            self.log(f"  저장 실패: {key.rpartition('/')[2]} - {error}")
+        
+        # 다음 날짜는 조절된 값에서 시작
+        self.max_workers = cur_workers
+        
+        elapsed_time = time.monotonic() - start_time
         avg_speed = downloaded_count / elapsed_time if elapsed_time > 0 else 0
         
-        return downloaded_count, failed_count, elapsed_time, avg_speed
+        return downloaded_count, failed_count, skipped_count, elapsed_time, avg_speed
     
     def start_download(self):
         """다운로드 시작"""
@@ -580,24 +921,45 @@ class S3DataDownloader:
         self.progress['value'] = 0
         self.status_label.config(text="다운로드 준비 중...")
         
-        # 동시 다운로드 수 업데이트
-        self.max_workers = self.workers_var.get()
+        # 동시 다운로드 수 업데이트 (직접 입력한 값도 연결 풀 크기를 넘지 않도록 제한)
+        self.max_workers = max(1, min(self.workers_var.get(), MAX_DOWNLOAD_WORKERS))
         
         # 별도 스레드에서 다운로드 실행
         thread = threading.Thread(target=self.download_data)
         thread.start()
     
+    def list_day_files(self, bucket, prefix, hour_suffixes=None):
+        """prefix로 시작하는 .dat 객체 목록과 페이지별 (페이지 번호, 파일 수, .dat 수) 반환
+        
+        hour_suffixes가 있으면 prefix + 'HH_' 별로 나눠 조회해 시간 범위 밖의 키는 목록으로 받지 않음.
+        목록 조회 스레드에서 실행되므로 로그는 남기지 않고, 페이지 통계는 다운로드 스레드가 받아서 기록
+        """
+        dat_files = []
+        page_stats = []
+        page_count = 0
+        # boto3 paginator로 모든 페이지 가져오기 (ContinuationToken 처리는 botocore가 담당)
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        list_prefixes = [prefix + suffix for suffix in hour_suffixes] if hour_suffixes else [prefix]
+        
+        for list_prefix in list_prefixes:
+            pages = paginator.paginate(Bucket=bucket, Prefix=list_prefix,
+                                       PaginationConfig={'PageSize': 1000})
+            for page in pages:
+                page_count += 1
+                if 'Contents' in page:
+                    files = page['Contents']
+                    # .dat 파일만 필터링 (S3 목록 API는 접미사 필터를 지원하지 않음)
+                    page_dat_files = [f for f in files if f['Key'].endswith('.dat')]
+                    dat_files.extend(page_dat_files)
+                    page_stats.append((page_count, len(files), len(page_dat_files)))
+        return dat_files, page_stats
+    
     def download_data(self):
         """데이터 다운로드 실행"""
         try:
             # S3 클라이언트 생성
             if not self.s3_client:
-                self.s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=self.aws_access_key,
-                    aws_secret_access_key=self.aws_secret_key,
-                    region_name=self.aws_region
-                )
+                self.s3_client = self.create_s3_client()
             
             # 날짜 범위 설정
             start_date = datetime(int(self.start_year.get()), 
@@ -613,117 +975,113 @@ class S3DataDownloader:
                                   int(self.end_day.get()))
                 self.log(f"기간별 다운로드: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
             
-            current_date = start_date
             total_days = (end_date - start_date).days + 1
             processed_days = 0
             total_files = 0
+            total_skipped = 0
             
             # 데이터 타입과 머신 ID 가져오기
             data_type = self.data_type_var.get()
             machine_id = self.machine_var.get()
             
             # 시간 범위 설정 로그
+            hour_suffixes = None
             if self.use_time_range_var.get():
                 time_range_str = f"{self.start_hour.get()}:{self.start_minute.get()} ~ {self.end_hour.get()}:{self.end_minute.get()}"
                 self.log(f"시간 범위: {time_range_str}")
+                
+                # 파일명이 YYYYMMDD_HH_... 형식이므로 범위에 걸친 시간만 prefix로 조회 (자정을 넘는 범위 포함)
+                start_hour = int(self.start_hour.get())
+                end_hour = int(self.end_hour.get())
+                hour_count = (end_hour - start_hour) % 24 + 1
+                # 같은 시각에서 시작 분 > 종료 분이면 하루 전체를 도는 범위
+                wraps_whole_day = start_hour == end_hour and int(self.start_minute.get()) > int(self.end_minute.get())
+                if hour_count < 24 and not wraps_whole_day:
+                    hour_suffixes = [f"{(start_hour + h) % 24:02d}_" for h in range(hour_count)]
+                    self.log(f"  목록 조회 시간대: {start_hour:02d}시 ~ {end_hour:02d}시 ({hour_count}개 prefix)")
             else:
                 self.log("시간 범위: 전체")
                 
             self.log(f"중복 파일 건너뛰기: {'예' if self.skip_existing_var.get() else '아니오'}")
             
-            while current_date <= end_date:
-                # S3 경로 생성: {machine_id}/raw_dat/{data_type}/{YYYYMMDD}_로 시작하는 모든 파일
-                date_str = current_date.strftime('%Y%m%d')
-                prefix = f"{machine_id}/raw_dat/{data_type}/{date_str}_"
-                
-                # 상태 업데이트
-                self.root.after(0, lambda d=current_date: self.status_label.config(
-                    text=f"{d.strftime('%Y-%m-%d')} 데이터 다운로드 중..."))
+            # S3 경로: {machine_id}/raw_dat/{data_type}/{YYYYMMDD}_로 시작하는 모든 파일
+            bucket = self.bucket_var.get()
+            save_root = self.save_path_var.get()
+            dates = [start_date + timedelta(days=i) for i in range(total_days)]
+            prefixes = [f"{machine_id}/raw_dat/{data_type}/{d:%Y%m%d}_" for d in dates]
+            day_labels = [f"{d:%Y-%m-%d}" for d in dates]
+            
+            # 목록 조회 전용 스레드 - 하루치를 다운로드하는 동안 다음 날짜 목록을 미리 가져와 LIST 왕복 시간을 숨김
+            with ThreadPoolExecutor(max_workers=1) as lister:
+                prefetch = lister.submit(self.list_day_files, bucket, prefixes[0], hour_suffixes)
                 
-                # 해당 날짜의 파일 목록 가져오기
-                try:
-                    self.log(f"\n{current_date.strftime('%Y-%m-%d')} 파일 검색 중...")
-                    self.log(f"  경로: {machine_id}/raw_dat/{data_type}/")
-                    self.log(f"  prefix: {prefix}")
-                    
-                    # 페이지네이션을 사용하여 모든 파일 가져오기
-                    dat_files = []
-                    continuation_token = None
-                    page_count = 0
-                    
-                    while True:
-                        page_count += 1
-                        if continuation_token:
-                            response = self.s3_client.list_objects_v2(
-                                Bucket=self.bucket_var.get(),
-                                Prefix=prefix,
-                                ContinuationToken=continuation_token
-                            )
-                        else:
-                            response = self.s3_client.list_objects_v2(
-                                Bucket=self.bucket_var.get(),
-                                Prefix=prefix
-                            )
-                        
-                        if 'Contents' in response:
-                            files = response['Contents']
-                            # .dat 파일만 필터링
-                            page_dat_files = [f for f in files if f['Key'].endswith('.dat')]
-                            dat_files.extend(page_dat_files)
-                            self.log(f"  페이지 {page_count}: {len(files)}개 파일 중 {len(page_dat_files)}개 .dat 파일")
-                        
-                        # 다음 페이지가 있는지 확인
-                        if response.get('IsTruncated', False):
-                            continuation_token = response.get('NextContinuationToken')
-                        else:
-                            break
+                for day_idx, (current_date, prefix, day_label) in enumerate(zip(dates, prefixes, day_labels)):
+                    list_future = prefetch
+                    if day_idx + 1 < total_days:
+                        prefetch = lister.submit(self.list_day_files, bucket, prefixes[day_idx + 1], hour_suffixes)
                     
-                    self.log(f"  총 파일 수: {len(dat_files)}개")
+                    # 상태 업데이트
+                    self.download_queue.put(('status', f"{day_label} 데이터 다운로드 중..."))
                     
-                    if dat_files:
-                        # 날짜별 폴더 생성
-                        date_folder = os.path.join(self.save_path_var.get(), 
-                                                 machine_id, 
-                                                 data_type.upper(),
-                                                 current_date.strftime('%Y-%m-%d'))
-                        os.makedirs(date_folder, exist_ok=True)
+                    # 해당 날짜의 파일 목록 가져오기
+                    try:
+                        self.log(f"\n{day_label} 파일 검색 중...")
+                        self.log(f"  경로: {machine_id}/raw_dat/{data_type}/")
+                        self.log(f"  prefix: {prefix}")
                         
-                        # 병렬 다운로드 실행
-                        self.log(f"  {len(dat_files)}개 파일 다운로드 시작 (스레드: {self.workers_var.get()}개)")
+                        dat_files, page_stats = list_future.result()
+                        for page_count, file_count, dat_count in page_stats:
+                            self.log(f"  페이지 {page_count}: {file_count}개 파일 중 {dat_count}개 .dat 파일")
                         
-                        downloaded_count, failed_count, elapsed_time, avg_speed = \
-                            self.download_files_parallel(dat_files, date_folder, current_date)
+                        self.log(f"  총 파일 수: {len(dat_files)}개")
                         
-                        total_files += downloaded_count
+                        if dat_files:
+                            # 날짜별 폴더 생성
+                            date_folder = os.path.join(save_root, 
+                                                     machine_id, 
+                                                     data_type.upper(),
+                                                     day_label)
+                            os.makedirs(date_folder, exist_ok=True)
+                            
+                            # 병렬 다운로드 실행
+                            self.log(f"  {len(dat_files)}개 파일 다운로드 시작 (스레드: {self.max_workers}개)")
+                            
+                            downloaded_count, failed_count, skipped_count, elapsed_time, avg_speed = \
+                                self.download_files_parallel(dat_files, date_folder, current_date)
+                            
+                            total_files += downloaded_count
+                            total_skipped += skipped_count
+                            
+                            self.log(f"\n{day_label} 완료:")
+                            self.log(f"  - 성공: {downloaded_count}개")
+                            if skipped_count > 0:
+                                self.log(f"  - 건너뜀: {skipped_count}개")
+                            if failed_count > 0:
+                                self.log(f"  - 실패: {failed_count}개")
+                            self.log(f"  - 소요 시간: {elapsed_time:.1f}초")
+                            self.log(f"  - 평균 속도: {avg_speed:.1f} 파일/초")
+                            self.log(f"  - 저장 위치: {date_folder}")
+                        else:
+                            self.log(f"{day_label} - 데이터 없음")
                         
-                        self.log(f"\n{current_date.strftime('%Y-%m-%d')} 완료:")
-                        self.log(f"  - 성공: {downloaded_count}개")
-                        if failed_count > 0:
-                            self.log(f"  - 실패: {failed_count}개")
-                        self.log(f"  - 소요 시간: {elapsed_time:.1f}초")
-                        self.log(f"  - 평균 속도: {avg_speed:.1f} 파일/초")
-                        self.log(f"  - 저장 위치: {date_folder}")
-                    else:
-                        self.log(f"{current_date.strftime('%Y-%m-%d')} - 데이터 없음")
+                    except Exception as e:
+                        self.log(f"오류 - {day_label}: {str(e)}")
                     
-                except Exception as e:
-                    self.log(f"오류 - {current_date.strftime('%Y-%m-%d')}: {str(e)}")
-                
-                # 진행률 업데이트
-                processed_days += 1
-                progress_value = (processed_days / total_days) * 100
-                self.root.after(0, lambda v=progress_value: self.progress.__setitem__('value', v))
-                
-                current_date = current_date + timedelta(days=1)
+                    # 진행률 업데이트
+                    processed_days += 1
+                    progress_value = (processed_days / total_days) * 100
+                    self.download_queue.put(('progress', progress_value))
             
             # 완료 메시지
             self.log(f"\n{'='*50}")
             self.log(f"다운로드 완료!")
             self.log(f"총 {total_files}개 파일 처리됨")
+            if total_skipped > 0:
+                self.log(f"이미 받은 파일 {total_skipped}개 건너뜀")
             self.log(f"기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
             self.log(f"{'='*50}")
             
-            self.root.after(0, lambda: self.status_label.config(text="다운로드 완료!"))
+            self.download_queue.put(('status', "다운로드 완료!"))
             self.root.after(0, lambda: messagebox.showinfo("완료", 
                 f"모든 데이터 다운로드가 완료되었습니다.\n총 {total_files}개 파일 처리"))
             
@@ -734,6 +1092,39 @@ class S3DataDownloader:
         finally:
             self.root.after(0, lambda: self.download_button.config(state='normal'))
     
+    def _drain_progress(self):
+        """쌓인 로그를 최대 LOG_FLUSH_BATCH줄씩 한 번에 삽입하고, 상태/진행률은 마지막 값만 반영한 뒤 다시 예약"""
+        pending_logs = []
+        while self._log_ring and len(pending_logs) < LOG_FLUSH_BATCH:
+            pending_logs.append(self._log_ring.popleft())
+        
+        status = None
+        progress = None
+        while True:
+            try:
+                kind, value = self.download_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'status':
+                status = value
+            elif kind == 'progress':
+                progress = value
+        
+        if pending_logs:
+            self.log_text.configure(state='normal')
+            self.log_text.insert(tk.END, ''.join(pending_logs))
+            # 오래된 줄 삭제 (마지막 빈 줄 포함 end-1c 기준)
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > MAX_LOG_LINES:
+                self.log_text.delete('1.0', f"{line_count - MAX_LOG_LINES}.0")
+            self.log_text.see(tk.END)
+            self.log_text.configure(state='disabled')
+        if status is not None:
+            self.status_label.config(text=status)
+        if progress is not None:
+            self.progress['value'] = progress
+        self.root.after(200, self._drain_progress)
+    
     def format_file_size(self, size):
         """파일 크기를 읽기 쉬운 형식으로 변환"""
         for unit in ['B', 'KB', 'MB', 'GB']:
@@ -743,12 +1134,8 @@ class S3DataDownloader:
         return f"{size:.1f} TB"
     
     def log(self, message):
-        """로그 텍스트 영역에 메시지 추가"""
-        self.log_text.configure(state='normal')
-        self.log_text.insert(tk.END, f"{datetime.now().strftime('%H:%M:%S')} - {message}\n")
-        self.log_text.see(tk.END)
-        self.log_text.configure(state='disabled')
-        self.root.update_idletasks()
+        """로그 메시지를 링 버퍼에 추가 (Tk 접근 없음, 실제 삽입은 _drain_progress가 200ms 단위로 모아서 처리)"""
+        self._log_ring.append(f"{datetime.now().strftime('%H:%M:%S')} - {message}\n")
 
 def main():
     root = tk.Tk()
@@ -5,11 +5,12 @@ import psycopg2
 import numpy as np
 from colorcet import fire, rainbow, coolwarm
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
 
-# DB 연결
-print("PostgreSQL 연결 중...")
-conn = psycopg2.connect(
+# DB 연결 정보 (병렬 로드 스레드마다 별도 연결을 염 - psycopg2 연결은 스레드 간 공유 불가)
+# 캐시가 있으면 DB에 연결하지 않도록 쿼리가 필요한 시점에만 연결함
+DB_CONFIG = dict(
     host="localhost",
     port="5432",
     database="pdm_db",
@@ -21,51 +22,176 @@ conn = psycopg2.connect(
 machine_id = 'HOTCHAMBER_M2'  # 또는 'CURINGOVEN_M1'
 start_date = '2025-04-01'
 end_date = '2025-07-30'
-
-# 전체 데이터 개수 확인
-count_query = f"""
-SELECT COUNT(*) 
-FROM normal_acc_data 
-WHERE machine_id = '{machine_id}'
-AND time >= '{start_date}'
-AND time < '{end_date}'
-"""
-
-cur = conn.cursor()
-cur.execute(count_query)
-total_count = cur.fetchone()[0]
-print(f"총 데이터 개수: {total_count:,}")
-
-# 데이터 로드 (청크 단위로)
-print("\n데이터 로딩 중...")
 chunk_size = 500000
-chunks = []
 
-for offset in range(0, total_count, chunk_size):
+# 기간을 같은 길이의 시간 구간으로 나눠 구간마다 연결 하나로 동시에 로드
+load_workers = 4
+range_start = datetime.fromisoformat(start_date)
+range_step = (datetime.fromisoformat(end_date) - range_start) / load_workers
+time_bounds = [range_start + range_step * i for i in range(load_workers)] + [datetime.fromisoformat(end_date)]
+time_ranges = list(zip(time_bounds[:-1], time_bounds[1:]))
+
+
+def count_ranges(table):
+    """time_ranges 구간별 행 수를 한 번의 스캔(FILTER 집계)으로 반환"""
+    filters = ",\n        ".join("COUNT(*) FILTER (WHERE time >= %s AND time < %s)" for _ in time_ranges)
     query = f"""
     SELECT 
-        EXTRACT(EPOCH FROM time) as time_epoch,
-        x, y, z
-    FROM normal_acc_data 
-    WHERE machine_id = '{machine_id}'
-    AND time >= '{start_date}'
-    AND time < '{end_date}'
-    ORDER BY time
-    LIMIT {chunk_size} OFFSET {offset}
+        {filters}
+    FROM {table} 
+    WHERE machine_id = %s
+    AND time >= %s
+    AND time < %s
+    """
+    params = [t for time_range in time_ranges for t in time_range] + [machine_id, start_date, end_date]
+    print("PostgreSQL 연결 중...")
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return list(cur.fetchone())
+    finally:
+        conn.close()
+
+
+def index_dtype(n):
+    """길이 n인 0부터의 인덱스 배열 dtype (int32로 표현할 수 없는 2³¹행 이상이면 int64)"""
+    return np.int32 if n < 2**31 else np.int64
+
+
+class CopyBinaryWriter:
+    """COPY ... TO STDOUT (FORMAT BINARY) 출력을 받는 file-like 객체
+    
+    모든 필드가 NULL 없는 float8이면 행이 고정 길이(필드 수 int16 + 필드마다 길이 int32 + 값 float8)이므로
+    모인 바이트를 np.frombuffer로 한 번에 레코드 배열로 보고 on_records에 넘김 (행마다 파이썬 튜플을 만들지 않음)
+    """
+    
+    def __init__(self, field_names, on_records, flush_rows):
+        fields = [('field_count', '>i2')]
+        for name in field_names:
+            fields += [(f'{name}_len', '>i4'), (name, '>f8')]
+        self.dtype = np.dtype(fields)
+        self.on_records = on_records
+        self.flush_bytes = flush_rows * self.dtype.itemsize
+        self.buf = bytearray()
+        self.header_done = False
+    
+    def write(self, data):
+        self.buf += data
+        if len(self.buf) >= self.flush_bytes:
+            self.flush()
+    
+    def flush(self):
+        start = 0
+        if not self.header_done:
+            # 헤더: 시그니처 11바이트 + 플래그 4바이트 + 확장 영역 길이 4바이트 + 확장 영역
+            if len(self.buf) < 19:
+                return
+            start = 19 + int.from_bytes(self.buf[15:19], 'big')
+            self.header_done = True
+        # 끝의 트레일러(2바이트)나 덜 받은 행은 다음 write/flush까지 남겨 둠
+        end = start + (len(self.buf) - start) // self.dtype.itemsize * self.dtype.itemsize
+        # bytearray는 뷰가 살아 있으면 크기를 바꿀 수 없으므로 완성된 행 부분만 떼어낸 뒤 앞부분 삭제
+        records = bytes(memoryview(self.buf)[start:end])
+        del self.buf[:end]
+        if records:
+            self.on_records(np.frombuffer(records, dtype=self.dtype))
+
+
+def load_table(table, columns, range_counts):
+    """time_ranges 구간마다 별도 연결에서 COPY BINARY로 동시에 스트리밍해 DataFrame으로 반환
+    
+    구간별 행 수(range_counts)로 전체 배열을 미리 잡고 각 스레드가 자기 구간 위치에 바로 복사하므로
+    pd.concat 복사가 없음 (COUNT 이후 추가된 행은 버리고, 줄어든 구간은 마지막에 앞으로 당겨 붙임).
+    센서 값은 Datashader 집계가 메모리 대역폭에 묶여 있으므로 float32로 저장 (시각은 정밀도 때문에 float64 유지)
+    """
+    value_names = [c.strip() for c in columns.split(',')]
+    # 고정 길이 레코드가 되도록 모든 값을 float8로 맞추고 NULL은 NaN으로 바꿈
+    value_exprs = ",\n            ".join(f"COALESCE({c}::float8, 'NaN')" for c in value_names)
+    query = f"""
+    COPY (
+        SELECT 
+            EXTRACT(EPOCH FROM time)::float8,
+            {value_exprs}
+        FROM {table} 
+        WHERE machine_id = %s
+        AND time >= %s
+        AND time < %s
+        ORDER BY time
+    ) TO STDOUT WITH (FORMAT BINARY)
     """
     
-    chunk = pd.read_sql(query, conn)
-    chunks.append(chunk)
-    print(f"  로드됨: {offset + len(chunk):,} / {total_count:,}")
+    total = sum(range_counts)
+    offsets = np.concatenate([[0], np.cumsum(range_counts)]).astype(np.int64)
+    time_epoch = np.empty(total, dtype=np.float64)
+    values = np.empty((len(value_names), total), dtype=np.float32)
+    
+    def load_range(i):
+        """i번째 구간을 자기 연결로 읽어 배열의 offsets[i] 위치부터 채우고 읽은 행 수 반환"""
+        t0, t1 = time_ranges[i]
+        start, count = offsets[i], range_counts[i]
+        pos = 0
+        
+        def on_records(records):
+            nonlocal pos
+            n = min(len(records), count - pos)
+            if n <= 0:
+                return
+            time_epoch[start + pos:start + pos + n] = records['time_epoch'][:n]
+            for j, name in enumerate(value_names):
+                values[j, start + pos:start + pos + n] = records[name][:n]
+            pos += n
+            print(f"  구간 {i + 1}/{len(time_ranges)} 로드됨: {pos:,} / {count:,}")
+        
+        range_conn = psycopg2.connect(**DB_CONFIG)
+        try:
+            with range_conn.cursor() as copy_cur:
+                # copy_expert는 파라미터를 받지 않으므로 mogrify로 값을 안전하게 바인딩
+                sql = copy_cur.mogrify(query, (machine_id, t0, t1)).decode()
+                writer = CopyBinaryWriter(['time_epoch'] + value_names, on_records, chunk_size)
+                copy_cur.copy_expert(sql, writer)
+                writer.flush()
+        finally:
+            range_conn.close()
+        return pos
+    
+    with ThreadPoolExecutor(max_workers=len(time_ranges)) as executor:
+        loaded = list(executor.map(load_range, range(len(time_ranges))))
+    
+    # COUNT보다 적게 읽힌 구간이 있으면 빈 자리 없이 앞으로 당김 (구간 순서대로라 덮어쓰지 않음)
+    pos = 0
+    for i, n in enumerate(loaded):
+        if offsets[i] != pos:
+            time_epoch[pos:pos + n] = time_epoch[offsets[i]:offsets[i] + n]
+            values[:, pos:pos + n] = values[:, offsets[i]:offsets[i] + n]
+        pos += n
+    
+    df = pd.DataFrame({name: values[i, :pos] for i, name in enumerate(value_names)})
+    df.insert(0, 'time_epoch', time_epoch[:pos])
+    return df
 
-# 데이터 합치기
-df = pd.concat(chunks, ignore_index=True)
-print(f"\n전체 로드 완료: {len(df):,} 행")
 
-# 시간을 0부터 시작하는 인덱스로 변환 (시각화 성능 향상)
-df['time_index'] = range(len(df))
+# 같은 머신/기간을 다시 그릴 때는 DB 대신 Parquet 캐시에서 로드 (기간 데이터가 바뀌었으면 캐시 파일을 지우고 실행)
+acc_cache = f"cache_acc_{machine_id}_{start_date}_{end_date}.parquet"
+if os.path.exists(acc_cache):
+    df = pd.read_parquet(acc_cache, engine='pyarrow')
+    total_count = len(df)
+    print(f"캐시에서 로드: {acc_cache} ({total_count:,} 행)")
+else:
+    # 전체 데이터 개수 확인 (구간별)
+    acc_counts = count_ranges('normal_acc_data')
+    total_count = sum(acc_counts)
+    print(f"총 데이터 개수: {total_count:,}")
+    
+    # 데이터 로드 (구간별 병렬, 청크 단위로)
+    print("\n데이터 로딩 중...")
+    df = load_table('normal_acc_data', 'x, y, z', acc_counts)
+    print(f"\n전체 로드 완료: {len(df):,} 행")
+    df.to_parquet(acc_cache, engine='pyarrow', compression='snappy', index=False)
+    print(f"  캐시 저장됨: {acc_cache}")
 
-conn.close()
+# 시간을 0부터 시작하는 인덱스로 변환 (시각화 성능 향상, 2³¹행 미만이면 int32로 메모리 절반)
+df['time_index'] = np.arange(len(df), dtype=index_dtype(len(df)))
 
 # Datashader 설정
 print("\n그래프 생성 중...")
@@ -74,18 +200,36 @@ print("\n그래프 생성 중...")
 width = 2000
 height = 600
 
-# 1. 개별 축 시각화
-for axis in ['x', 'y', 'z']:
+# 3축을 한 번의 라인 집계로 처리하기 위한 long-form 프레임 (time_index, value, axis)
+# 축마다 캔버스를 따로 만들면 y 범위가 축별 min~max로 잡히므로, 같은 결과가 되도록 값을 축별로 0~1 정규화.
+# 축 사이에 NaN 행을 넣어 한 축의 끝과 다음 축의 시작이 선으로 이어지지 않게 함
+axes = ['x', 'y', 'z']
+n = len(df)
+long_values = np.full(len(axes) * (n + 1), np.nan, dtype=np.float32)
+for i, axis in enumerate(axes):
+    v = df[axis].to_numpy()
+    lo, hi = np.nanmin(v), np.nanmax(v)
+    seg = long_values[i * (n + 1):i * (n + 1) + n]
+    np.subtract(v, lo, out=seg)
+    if hi > lo:
+        seg /= hi - lo
+long_df = pd.DataFrame({
+    'time_index': np.tile(np.arange(n + 1, dtype=index_dtype(n + 1)), len(axes)),
+    'value': long_values,
+    'axis': pd.Categorical.from_codes(np.repeat(np.arange(len(axes), dtype=np.int8), n + 1), categories=axes),
+})
+
+# 1. 개별 축 시각화 - 3축을 한 번에 집계해 축별 평면(axis 차원)으로 나눔
+#    (축별 cvs.line 기본값과 같은 any() 집계라 색상이 이전과 동일함)
+print("\n개별 축 집계...")
+cvs = ds.Canvas(plot_width=width, plot_height=height, x_range=(0, n - 1), y_range=(0, 1))
+agg_axes = cvs.line(long_df, x='time_index', y='value', agg=ds.by('axis', ds.any()))
+
+for axis in axes:
     print(f"\n{axis.upper()}축 렌더링...")
     
-    # 캔버스 생성
-    cvs = ds.Canvas(plot_width=width, plot_height=height)
-    
-    # 라인 집계
-    agg = cvs.line(df, x='time_index', y=axis)
-    
     # 색상 적용
-    img = tf.shade(agg, cmap=fire if axis=='x' else (coolwarm if axis=='y' else rainbow))
+    img = tf.shade(agg_axes.sel(axis=axis), cmap=fire if axis=='x' else (coolwarm if axis=='y' else rainbow))
     
     # 배경 설정
     img = tf.set_background(img, 'white')
@@ -98,24 +242,16 @@ for axis in ['x', 'y', 'z']:
 # 2. 3축 통합 시각화
 print("\n3축 통합 그래프 생성...")
 
-# 각 축을 다른 색상으로
-cvs = ds.Canvas(plot_width=width, plot_height=height*2)
-
-# X축 - 파란색
-agg_x = cvs.line(df, x='time_index', y='x')
-img_x = tf.shade(agg_x, cmap=['lightblue', 'darkblue'])
+# 각 축을 다른 색상으로 - 개별 축과 같은 long-form 프레임을 한 번만 집계해 3채널 결과를 얻음
+cvs = ds.Canvas(plot_width=width, plot_height=height*2, x_range=(0, n - 1), y_range=(0, 1))
+agg_all = cvs.line(long_df, x='time_index', y='value', agg=ds.count_cat('axis'))
 
-# Y축 - 녹색  
-agg_y = cvs.line(df, x='time_index', y='y')
-img_y = tf.shade(agg_y, cmap=['lightgreen', 'darkgreen'])
+# X축 - 파란색, Y축 - 녹색, Z축 - 빨간색으로 한 이미지에 합성
+img_all = tf.shade(agg_all, color_key={'x': 'darkblue', 'y': 'darkgreen', 'z': 'darkred'})
 
-# Z축 - 빨간색
-agg_z = cvs.line(df, x='time_index', y='z')
-img_z = tf.shade(agg_z, cmap=['pink', 'darkred'])
-
-# 이미지 합성
+# 이미지 저장
 from datashader.utils import export_image
-export_image(img_x, filename='acc_all_axes', background='white')
+export_image(img_all, filename='acc_all_axes', background='white')
 
 print("\n✅ 모든 그래프 생성 완료!")
 
@@ -125,12 +261,25 @@ print("\n인터랙티브 HTML 생성 중...")
 from bokeh.plotting import figure, output_file, save
 from bokeh.models import DatetimeTickFormatter
 
-# 시간 축 복원
-df['time'] = pd.to_datetime(df['time_epoch'], unit='s')
+# 이미 로드한 데이터를 같은 폭의 시간 구간으로 나눠 구간별 min/max로 다운샘플링 (인터랙티브용, DB 재조회 없음)
+# 무작위 샘플링은 피크가 빠져 파형 윤곽이 사라지므로, 구간마다 최소값(구간 첫 시각)과 최대값(구간 끝 시각) 두 점을 그림
+interactive_buckets = 50000
+# time_epoch는 구간 순서대로 ORDER BY time으로 로드해 정렬되어 있으므로 구간 경계를 searchsorted로 찾음
+# (전체 행 크기의 임시 배열 없이 구간 수만큼만 계산, 빈 구간은 unique로 빠짐)
+t = df['time_epoch'].to_numpy()
+t_lo, t_hi = t[0], t[-1]
+edges = t_lo + (t_hi - t_lo) * (np.arange(interactive_buckets) / interactive_buckets)
+starts = np.unique(np.searchsorted(t, edges, side='left'))
+ends = np.append(starts[1:], len(t))
 
-# 샘플링 (인터랙티브용)
-sample_size = min(100000, len(df))
-df_sample = df.sample(n=sample_size, random_state=42).sort_values('time')
+# 구간별 (min, max) 쌍을 시간 순서대로 펼침 (NULL이었던 NaN은 SQL min/max처럼 무시)
+df_sample = pd.DataFrame({
+    'time': pd.to_datetime(np.column_stack([t[starts], t[ends - 1]]).ravel(), unit='s', utc=True),
+    **{axis: np.column_stack([np.fmin.reduceat(df[axis].to_numpy(), starts),
+                              np.fmax.reduceat(df[axis].to_numpy(), starts)]).ravel()
+       for axis in axes},
+})
+sample_size = len(df_sample)
 
 p = figure(
     width=1400, 
@@ -154,39 +303,25 @@ print(f"  저장됨: acc_interactive_{machine_id}.html")
 # 4. MIC 데이터도 처리
 print("\n\nMIC 데이터 처리...")
 
-# MIC 데이터 개수 확인
-cur = conn.cursor()
-cur.execute(f"""
-SELECT COUNT(*) 
-FROM normal_mic_data 
-WHERE machine_id = '{machine_id}'
-AND time >= '{start_date}'
-AND time < '{end_date}'
-""")
-mic_count = cur.fetchone()[0]
-print(f"MIC 데이터 개수: {mic_count:,}")
+mic_cache = f"cache_mic_{machine_id}_{start_date}_{end_date}.parquet"
+if os.path.exists(mic_cache):
+    df_mic = pd.read_parquet(mic_cache, engine='pyarrow')
+    mic_count = len(df_mic)
+    print(f"캐시에서 로드: {mic_cache} ({mic_count:,} 행)")
+else:
+    # MIC 데이터 개수 확인 (구간별)
+    mic_counts = count_ranges('normal_mic_data')
+    mic_count = sum(mic_counts)
+    print(f"MIC 데이터 개수: {mic_count:,}")
+    
+    if mic_count > 0:
+        # MIC 데이터 로드
+        df_mic = load_table('normal_mic_data', 'mic_value', mic_counts)
+        df_mic.to_parquet(mic_cache, engine='pyarrow', compression='snappy', index=False)
+        print(f"  캐시 저장됨: {mic_cache}")
 
 if mic_count > 0:
-    # MIC 데이터 로드
-    mic_chunks = []
-    for offset in range(0, mic_count, chunk_size):
-        query = f"""
-        SELECT 
-            EXTRACT(EPOCH FROM time) as time_epoch,
-            mic_value
-        FROM normal_mic_data 
-        WHERE machine_id = '{machine_id}'
-        AND time >= '{start_date}'
-        AND time < '{end_date}'
-        ORDER BY time
-        LIMIT {chunk_size} OFFSET {offset}
-        """
-        
-        chunk = pd.read_sql(query, conn)
-        mic_chunks.append(chunk)
-    
-    df_mic = pd.concat(mic_chunks, ignore_index=True)
-    df_mic['time_index'] = range(len(df_mic))
+    df_mic['time_index'] = np.arange(len(df_mic), dtype=index_dtype(len(df_mic)))
     
     # MIC 시각화
     cvs_mic = ds.Canvas(plot_width=width, plot_height=height)
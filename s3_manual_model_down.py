@@ -2,10 +2,20 @@
 # manual_s3_down.py
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 import os
 import shutil
 from common_utils import load_aws_config, load_config
 
+# 모델/스케일러 파일은 하나씩 받으므로 파일 내부 구간 병렬 다운로드는 유지하고,
+# 구간 크기는 S3 권장 범위(8~16MB)로, 디스크 기록 단위는 기본 256KB에서 1MB로 키움
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    io_chunksize=1024 * 1024,
+    use_threads=True
+)
+
 def download_manual_files():
     # AWS 설정
     aws_cfg = load_aws_config()
@@ -108,7 +118,7 @@ def download_manual_files():
                     print(f"   💾 Backed up existing file")
                 
                 # S3에서 다운로드
-                s3.download_file(bucket, file_key, local_path)
+                s3.download_file(bucket, file_key, local_path, Config=TRANSFER_CONFIG)
                 print(f"   ✅ Downloaded to: {local_path}")
                 success_count += 1
                 